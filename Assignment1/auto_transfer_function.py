@@ -0,0 +1,142 @@
+import vtk
+import argparse
+import time
+import numpy as np
+from vtk.util import numpy_support
+
+# Same colour ramp as the hand-made Isabel transfer function, low to high value
+COLOR_RAMP = [
+    (0.0, 1.0, 1.0),
+    (0.0, 0.0, 1.0),
+    (0.0, 0.0, 0.5),
+    (1.0, 0.0, 0.0),
+    (1.0, 0.4, 0.0),
+    (1.0, 1.0, 0.0),
+]
+COLOR_PERCENTILES = [0.5, 5, 25, 50, 75, 99.5]
+
+def volume_array(image_data):
+    # Zero-copy (z, y, x) view of the active point scalars
+    nx, ny, nz = image_data.GetDimensions()
+    scalars = numpy_support.vtk_to_numpy(image_data.GetPointData().GetScalars())
+    return scalars.reshape(nz, ny, nx)
+
+def gradient_histogram(image_data, value_bins=256, grad_bins=64, chunk=16):
+    volume = volume_array(image_data)
+    sx, sy, sz = image_data.GetSpacing()
+    vmin, vmax = image_data.GetPointData().GetScalars().GetRange()
+    if vmax <= vmin:
+        vmax = vmin + 1.0
+
+    # Largest possible finite difference; gradient bins are log-spaced up to it
+    grad_bound = np.sqrt(3.0) * (vmax - vmin) / min(sx, sy, sz)
+    log_bound = np.log1p(grad_bound)
+    value_scale = value_bins / (vmax - vmin)
+
+    hist = np.zeros(value_bins * grad_bins, dtype=np.int64)
+    nz = volume.shape[0]
+    for z0 in range(0, nz, chunk):
+        z1 = min(z0 + chunk, nz)
+        # One halo slice on each side so the slab gradient matches the full one
+        lo, hi = max(z0 - 1, 0), min(z1 + 1, nz)
+        slab = volume[lo:hi].astype(np.float32)
+        if slab.shape[0] > 1:
+            gz, gy, gx = np.gradient(slab, sz, sy, sx)
+        else:
+            # Single-slice (2D) volumes have no z gradient
+            gy, gx = np.gradient(slab[0], sy, sx)
+            gz, gy, gx = np.zeros_like(slab), gy[None], gx[None]
+        inner = slice(z0 - lo, z0 - lo + (z1 - z0))
+        values = slab[inner]
+        grad = np.sqrt(gx[inner] ** 2 + gy[inner] ** 2 + gz[inner] ** 2)
+
+        vbin = ((values - vmin) * value_scale).astype(np.int32)
+        np.clip(vbin, 0, value_bins - 1, out=vbin)
+        gbin = (np.log1p(grad) * (grad_bins / log_bound)).astype(np.int32)
+        np.clip(gbin, 0, grad_bins - 1, out=gbin)
+        hist += np.bincount((vbin * grad_bins + gbin).ravel(), minlength=hist.size)
+
+    value_edges = np.linspace(vmin, vmax, value_bins + 1)
+    grad_edges = np.expm1(np.linspace(0.0, log_bound, grad_bins + 1))
+    return hist.reshape(value_bins, grad_bins), value_edges, grad_edges
+
+def find_boundaries(hist, grad_edges, count=3, smooth=5):
+    # Boundaries between materials show up as value bins with a high mean gradient
+    grad_centers = 0.5 * (grad_edges[:-1] + grad_edges[1:])
+    per_value = hist.sum(axis=1)
+    mean_grad = np.divide(hist @ grad_centers, per_value,
+                          out=np.zeros(len(per_value)), where=per_value > 0)
+    # Smooth over neighbouring bins and ignore nearly empty ones so noise does not win
+    mean_grad = np.convolve(mean_grad, np.ones(smooth) / smooth, mode='same')
+    mean_grad[per_value < 1e-4 * per_value.sum()] = 0.0
+
+    # Greedily take the strongest bins, keeping boundaries apart from each other
+    separation = max(len(per_value) // 16, 1)
+    peaks = []
+    for idx in np.argsort(mean_grad)[::-1]:
+        if len(peaks) == count or mean_grad[idx] <= 0:
+            break
+        if all(abs(idx - p) >= separation for p in peaks):
+            peaks.append(idx)
+    return np.sort(np.array(peaks, dtype=np.int64)), mean_grad
+
+def value_percentiles(hist, value_edges, percentiles):
+    cdf = np.cumsum(hist.sum(axis=1))
+    cdf = cdf / cdf[-1]
+    idx = np.searchsorted(cdf, np.asarray(percentiles) / 100.0)
+    idx = np.clip(idx, 0, len(value_edges) - 2)
+    return 0.5 * (value_edges[idx] + value_edges[idx + 1])
+
+def build_transfer_functions(hist, value_edges, grad_edges, max_opacity=0.6, boundaries=3):
+    ctf = vtk.vtkColorTransferFunction()
+    for value, rgb in zip(value_percentiles(hist, value_edges, COLOR_PERCENTILES), COLOR_RAMP):
+        ctf.AddRGBPoint(value, *rgb)
+
+    otf = vtk.vtkPiecewiseFunction()
+    lo, hi = value_percentiles(hist, value_edges, [0.5, 99.5])
+    otf.AddPoint(value_edges[0], 0.0)
+    otf.AddPoint(lo, 0.0)
+    otf.AddPoint(hi, 0.0)
+    otf.AddPoint(value_edges[-1], 0.0)
+
+    peaks, mean_grad = find_boundaries(hist, grad_edges, boundaries)
+    if len(peaks):
+        strength = mean_grad[peaks] / mean_grad[peaks].max()
+        width = value_edges[1] - value_edges[0]
+        for peak, s in zip(peaks, strength):
+            center = 0.5 * (value_edges[peak] + value_edges[peak + 1])
+            # Narrow tent around each boundary value
+            otf.AddPoint(center - 2 * width, 0.0)
+            otf.AddPoint(center, float(max_opacity * s))
+            otf.AddPoint(center + 2 * width, 0.0)
+    return ctf, otf
+
+def auto_transfer_functions(image_data, value_bins=256, grad_bins=64, chunk=16):
+    hist, value_edges, grad_edges = gradient_histogram(image_data, value_bins, grad_bins, chunk)
+    return build_transfer_functions(hist, value_edges, grad_edges)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Generate transfer functions from a value x gradient histogram')
+    parser.add_argument('input', help='Input VTKImageData file (.vti)')
+    parser.add_argument('--value-bins', type=int, default=256, help='Scalar value bins (default: 256)')
+    parser.add_argument('--grad-bins', type=int, default=64, help='Gradient magnitude bins (default: 64)')
+    parser.add_argument('--chunk', type=int, default=16, help='Z slices per chunk (default: 16)')
+
+    args = parser.parse_args()
+
+    reader = vtk.vtkXMLImageDataReader()
+    reader.SetFileName(args.input)
+    reader.Update()
+
+    start = time.perf_counter()
+    ctf, otf = auto_transfer_functions(reader.GetOutput(), args.value_bins, args.grad_bins, args.chunk)
+    print(f"Transfer functions built in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    node = [0.0] * 6
+    for i in range(ctf.GetSize()):
+        ctf.GetNodeValue(i, node)
+        print(f"  colour   {node[0]:12.3f} -> ({node[1]:.2f}, {node[2]:.2f}, {node[3]:.2f})")
+    node = [0.0] * 4
+    for i in range(otf.GetSize()):
+        otf.GetNodeValue(i, node)
+        print(f"  opacity  {node[0]:12.3f} -> {node[1]:.3f}")
@@ -1,5 +1,20 @@
 import vtk
 import argparse
+import csv
+import json
+import multiprocessing
+import os
+import time
+from auto_transfer_function import auto_transfer_functions
+
+# (image sample distance, sample distance scale) from coarsest to full quality
+PROGRESSIVE_PASSES = [(4.0, 4.0), (2.0, 2.0), (1.0, 1.0)]
+
+RENDER_MODES = {
+    'default': vtk.vtkSmartVolumeMapper.DefaultRenderMode,
+    'raycast': vtk.vtkSmartVolumeMapper.RayCastRenderMode,
+    'gpu': vtk.vtkSmartVolumeMapper.GPURenderMode,
+}
 
 def setup_color_transfer_function():
     ctf = vtk.vtkColorTransferFunction()
@@ -18,21 +33,41 @@ def setup_opacity_transfer_function():
     otf.AddPoint(2594.97, 0.0)
     return otf
 
-def volume_render(input_file, use_phong):
+def build_pipeline(input_file, use_phong, offscreen=False, auto_tf=False, progressive=False,
+                   render_mode='default', sample_distance=None, interpolation='linear',
+                   shade=True, size=1000):
     # Read the input volume data
     reader = vtk.vtkXMLImageDataReader()
     reader.SetFileName(input_file)
     reader.Update()
     
-    # Create volume mapper
-    volume_mapper = vtk.vtkSmartVolumeMapper()
+    # Create volume mapper; progressive mode needs the ray cast mapper's image sample distance
+    if progressive:
+        volume_mapper = vtk.vtkGPUVolumeRayCastMapper()
+        volume_mapper.AutoAdjustSampleDistancesOff()
+    else:
+        volume_mapper = vtk.vtkSmartVolumeMapper()
+        volume_mapper.SetRequestedRenderMode(RENDER_MODES[render_mode])
     volume_mapper.SetInputConnection(reader.GetOutputPort())
+    if sample_distance is not None:
+        volume_mapper.AutoAdjustSampleDistancesOff()
+        volume_mapper.SetSampleDistance(sample_distance)
     
     # Create volume property
     volume_property = vtk.vtkVolumeProperty()
-    volume_property.SetColor(setup_color_transfer_function())
-    volume_property.SetScalarOpacity(setup_opacity_transfer_function())
-    volume_property.ShadeOn()
+    if auto_tf:
+        start = time.perf_counter()
+        ctf, otf = auto_transfer_functions(reader.GetOutput())
+        print(f"Automatic transfer functions built in {(time.perf_counter() - start) * 1000:.1f} ms")
+    else:
+        ctf, otf = setup_color_transfer_function(), setup_opacity_transfer_function()
+    volume_property.SetColor(ctf)
+    volume_property.SetScalarOpacity(otf)
+    volume_property.SetShade(shade)
+    if interpolation == 'nearest':
+        volume_property.SetInterpolationTypeToNearest()
+    else:
+        volume_property.SetInterpolationTypeToLinear()
     
     if use_phong:
         volume_property.SetAmbient(0.5)
@@ -60,23 +95,336 @@ def volume_render(input_file, use_phong):
     
     # Create render window
     render_window = vtk.vtkRenderWindow()
-    render_window.SetSize(1000, 1000)
+    render_window.SetSize(size, size)
+    render_window.SetOffScreenRendering(offscreen)
     render_window.AddRenderer(renderer)
     
+    return render_window, renderer, volume_mapper
+
+class FrameTimer:
+    # Times every render of a renderer through its StartEvent/EndEvent observers
+    def __init__(self, renderer, log_every=0):
+        self.log_every = log_every
+        self.times = []
+        self._start = 0.0
+        renderer.AddObserver('StartEvent', self.on_start)
+        renderer.AddObserver('EndEvent', self.on_end)
+    
+    def on_start(self, obj, event):
+        self._start = time.perf_counter()
+    
+    def on_end(self, obj, event):
+        elapsed = time.perf_counter() - self._start
+        self.times.append(elapsed)
+        if self.log_every and len(self.times) % self.log_every == 0:
+            recent = self.times[-self.log_every:]
+            print(f"frame {len(self.times)}: {elapsed * 1000:.2f} ms, "
+                  f"{len(recent) / sum(recent):.1f} FPS over last {len(recent)} frames")
+    
+    def reset(self):
+        self.times = []
+    
+    def summary(self):
+        times = sorted(self.times)
+        n = len(times)
+        if n == 0:
+            return {}
+        mean = sum(times) / n
+        return {
+            'frames': n,
+            'mean_ms': mean * 1000,
+            'median_ms': times[n // 2] * 1000,
+            'p95_ms': times[min(int(n * 0.95), n - 1)] * 1000,
+            'min_ms': times[0] * 1000,
+            'max_ms': times[-1] * 1000,
+            'fps': 1.0 / mean,
+        }
+
+class ProgressiveRefinement:
+    # Renders coarse-to-fine passes, restarting from the coarsest one whenever the camera moves
+    def __init__(self, render_window, volume_mapper, passes=PROGRESSIVE_PASSES):
+        self.render_window = render_window
+        self.volume_mapper = volume_mapper
+        self.passes = passes
+        self.base_sample_distance = volume_mapper.GetSampleDistance()
+        self.interactor = None
+        self.interacting = False
+        self.pass_index = 0
+        self.start_time = 0.0
+        self.time_to_first = None
+        self.history = []
+    
+    def attach(self, interactor):
+        self.interactor = interactor
+        interactor.AddObserver('StartInteractionEvent', self.on_start_interaction)
+        interactor.AddObserver('EndInteractionEvent', self.on_end_interaction)
+        interactor.AddObserver('TimerEvent', self.on_timer)
+    
+    def apply_pass(self, index):
+        image_sample_distance, sample_scale = self.passes[index]
+        self.volume_mapper.SetImageSampleDistance(image_sample_distance)
+        self.volume_mapper.SetSampleDistance(self.base_sample_distance * sample_scale)
+    
+    def start(self):
+        self.pass_index = 0
+        self.start_time = time.perf_counter()
+        self.render_pass()
+    
+    def render_pass(self):
+        self.apply_pass(self.pass_index)
+        self.render_window.Render()
+        elapsed = time.perf_counter() - self.start_time
+        if self.pass_index == 0:
+            self.time_to_first = elapsed
+        if self.pass_index == len(self.passes) - 1:
+            self.history.append((self.time_to_first, elapsed))
+            print(f"Progressive: first image {self.time_to_first * 1000:.2f} ms, "
+                  f"final image {elapsed * 1000:.2f} ms")
+        elif self.interactor is not None:
+            # Yield to the event loop so a camera move can cut the refinement short
+            self.interactor.CreateOneShotTimer(1)
+    
+    def refine(self):
+        # Blocking version for offscreen rendering: all passes back to back
+        self.start()
+        while self.pass_index < len(self.passes) - 1:
+            self.pass_index += 1
+            self.render_pass()
+        return self.history[-1]
+    
+    def on_timer(self, obj, event):
+        if self.interacting or self.pass_index >= len(self.passes) - 1:
+            return
+        self.pass_index += 1
+        self.render_pass()
+    
+    def on_start_interaction(self, obj, event):
+        # Camera is moving: drop pending refinement and stay coarse while it does
+        self.interacting = True
+        self.pass_index = len(self.passes) - 1
+        self.apply_pass(0)
+    
+    def on_end_interaction(self, obj, event):
+        self.interacting = False
+        self.start()
+
+def volume_render(input_file, use_phong, auto_tf=False, progressive=False, log_fps=0):
+    render_window, renderer, volume_mapper = build_pipeline(
+        input_file, use_phong, auto_tf=auto_tf, progressive=progressive)
+    if log_fps:
+        FrameTimer(renderer, log_every=log_fps)
+    
     # Create interactor
     interactor = vtk.vtkRenderWindowInteractor()
     interactor.SetRenderWindow(render_window)
+    interactor.Initialize()
     
     # Start rendering
-    render_window.Render()
+    if progressive:
+        refinement = ProgressiveRefinement(render_window, volume_mapper)
+        refinement.attach(interactor)
+        refinement.start()
+    else:
+        render_window.Render()
     interactor.Start()
 
+def read_camera_path(path_file):
+    # One camera position per line: "x y z", blank lines and # comments ignored
+    positions = []
+    with open(path_file) as f:
+        for line in f:
+            line = line.split('#')[0].strip()
+            if line:
+                positions.append(tuple(float(v) for v in line.split()[:3]))
+    if not positions:
+        raise ValueError(f"camera path {path_file} has no positions")
+    return positions
+
+def setup_camera_path(renderer, frames, elevation=0.0, path_file=None):
+    # Returns a function that moves the camera to frame i of the orbit or path
+    camera = renderer.GetActiveCamera()
+    renderer.ResetCamera()
+    camera.Elevation(elevation)
+    camera.OrthogonalizeViewUp()
+    start_position = camera.GetPosition()
+    
+    positions = read_camera_path(path_file) if path_file else None
+    if positions:
+        frames = len(positions)
+    
+    def move_to(i):
+        if positions:
+            camera.SetPosition(positions[i])
+        else:
+            camera.SetPosition(start_position)
+            camera.Azimuth(360.0 * i / frames)
+        renderer.ResetCameraClippingRange()
+    
+    return frames, move_to
+
+def render_frames(input_file, output_dir, frames, use_phong, elevation=0.0, path_file=None,
+                  auto_tf=False, progressive=False):
+    render_window, renderer, volume_mapper = build_pipeline(
+        input_file, use_phong, offscreen=True, auto_tf=auto_tf, progressive=progressive)
+    refinement = ProgressiveRefinement(render_window, volume_mapper) if progressive else None
+    frames, move_to = setup_camera_path(renderer, frames, elevation, path_file)
+    
+    # One capture/writer pair reused for every frame
+    window_to_image = vtk.vtkWindowToImageFilter()
+    window_to_image.SetInput(render_window)
+    window_to_image.ReadFrontBufferOff()
+    writer = vtk.vtkPNGWriter()
+    writer.SetInputConnection(window_to_image.GetOutputPort())
+    
+    os.makedirs(output_dir, exist_ok=True)
+    name = os.path.splitext(os.path.basename(input_file))[0]
+    times = []
+    for i in range(frames):
+        move_to(i)
+        if refinement:
+            first, elapsed = refinement.refine()
+        else:
+            start = time.perf_counter()
+            render_window.Render()
+            elapsed = time.perf_counter() - start
+        times.append(elapsed)
+        
+        window_to_image.Modified()
+        writer.SetFileName(os.path.join(output_dir, f"{name}_{i:04d}.png"))
+        writer.Write()
+        if refinement:
+            print(f"{name} frame {i:04d}: first image {first * 1000:.2f} ms, final {elapsed * 1000:.2f} ms")
+        else:
+            print(f"{name} frame {i:04d}: {elapsed * 1000:.2f} ms")
+    
+    if not times:
+        print(f"{name}: no frames rendered")
+        return times
+    total = sum(times)
+    print(f"{name}: {frames} frames in {total:.3f} s, "
+          f"mean {total / frames * 1000:.2f} ms, max {max(times) * 1000:.2f} ms")
+    if refinement:
+        first_mean = sum(h[0] for h in refinement.history) / len(refinement.history)
+        print(f"{name}: mean time to first image {first_mean * 1000:.2f} ms")
+    return times
+
+def _render_frames_job(job):
+    return render_frames(*job)
+
+def benchmark(input_file, report_file, render_modes, sample_distances, sizes, interpolations,
+              frames, elevation=0.0, path_file=None, use_phong=False):
+    # Check the camera path before the sweep, not after the first mapper is built
+    if path_file:
+        read_camera_path(path_file)
+    elif frames < 1:
+        raise ValueError(f"benchmark needs at least 1 frame, got {frames}")
+    rows = []
+    for render_mode in render_modes:
+        for sample_distance in sample_distances:
+            for size in sizes:
+                for interpolation in interpolations:
+                    for shade in (True, False):
+                        render_window, renderer, volume_mapper = build_pipeline(
+                            input_file, use_phong, offscreen=True, render_mode=render_mode,
+                            sample_distance=sample_distance, interpolation=interpolation,
+                            shade=shade, size=size)
+                        path_frames, move_to = setup_camera_path(renderer, frames, elevation, path_file)
+                        timer = FrameTimer(renderer)
+                        
+                        # First render uploads the volume and compiles shaders; keep it apart
+                        render_window.Render()
+                        first_ms = timer.times[0] * 1000
+                        timer.reset()
+                        for i in range(path_frames):
+                            move_to(i)
+                            render_window.Render()
+                        
+                        row = {
+                            'render_mode': render_mode,
+                            'used_render_mode': volume_mapper.GetLastUsedRenderMode(),
+                            'sample_distance': volume_mapper.GetSampleDistance(),
+                            'image_size': size,
+                            'interpolation': interpolation,
+                            'shade': shade,
+                            'first_frame_ms': first_ms,
+                        }
+                        row.update(timer.summary())
+                        rows.append(row)
+                        print(f"{render_mode:>8} sd={row['sample_distance']:<6g} {size:>5}px "
+                              f"{interpolation:>7} shade={'on' if shade else 'off':<3} "
+                              f"{row['mean_ms']:8.2f} ms {row['fps']:7.1f} FPS")
+                        render_window.Finalize()
+    
+    if report_file.endswith('.json'):
+        with open(report_file, 'w') as f:
+            json.dump({'input': input_file, 'frames': frames, 'results': rows}, f, indent=2)
+    else:
+        with open(report_file, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0].keys()))
+            writer.writeheader()
+            writer.writerows(rows)
+    print(f"Benchmark report written to {report_file}")
+    return rows
+
+def positive_int(value):
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return number
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description='Volume rendering with VTK')
-    parser.add_argument('input', help='Input VTKImageData file (.vti)')
+    parser.add_argument('input', nargs='+', help='Input VTKImageData file(s) (.vti)')
     parser.add_argument('--phong', action='store_true', 
                        help='Enable Phong shading (default: False)')
+    parser.add_argument('--auto-tf', action='store_true',
+                       help='Build the transfer functions from the volume histogram instead of the fixed Isabel ones')
+    parser.add_argument('--progressive', action='store_true',
+                       help='Show a coarse image first and refine it over several passes')
+    parser.add_argument('--offscreen', action='store_true',
+                       help='Render frames to PNG files instead of opening a window')
+    parser.add_argument('--frames', type=positive_int, default=36,
+                       help='Number of frames along the camera orbit (default: 36)')
+    parser.add_argument('--elevation', type=float, default=0.0,
+                       help='Camera elevation of the orbit in degrees (default: 0)')
+    parser.add_argument('--path', default=None,
+                       help='Text file with one "x y z" camera position per line, used instead of the orbit')
+    parser.add_argument('--output-dir', default='frames',
+                       help='Directory for the numbered PNG frames (default: frames)')
+    parser.add_argument('--log-fps', type=int, default=0, metavar='N',
+                       help='Print frame time and FPS every N rendered frames (default: off)')
+    parser.add_argument('--benchmark', default=None, metavar='REPORT',
+                       help='Sweep mapper settings offscreen and write a .csv or .json report')
+    parser.add_argument('--render-modes', nargs='+', default=['default', 'raycast', 'gpu'],
+                       choices=list(RENDER_MODES), help='Benchmark: requested render modes')
+    parser.add_argument('--sample-distances', nargs='+', type=float, default=[0.5, 1.0, 2.0],
+                       help='Benchmark: ray sample distances')
+    parser.add_argument('--sizes', nargs='+', type=int, default=[500, 1000],
+                       help='Benchmark: image sizes in pixels')
+    parser.add_argument('--interpolations', nargs='+', default=['linear', 'nearest'],
+                       choices=['linear', 'nearest'], help='Benchmark: interpolation types')
+    parser.add_argument('--jobs', type=int, default=1,
+                       help='Number of volumes rendered in parallel processes (default: 1)')
     
     args = parser.parse_args()
+    if args.path:
+        try:
+            read_camera_path(args.path)
+        except (OSError, ValueError) as e:
+            parser.error(f"--path: {e}")
     
-    volume_render(args.input, args.phong)
\ No newline at end of file
+    if args.benchmark:
+        benchmark(args.input[0], args.benchmark, args.render_modes, args.sample_distances,
+                  args.sizes, args.interpolations, args.frames, args.elevation, args.path, args.phong)
+    elif args.offscreen:
+        jobs = [(f, args.output_dir, args.frames, args.phong, args.elevation, args.path,
+                 args.auto_tf, args.progressive)
+                for f in args.input]
+        if args.jobs > 1 and len(jobs) > 1:
+            with multiprocessing.Pool(min(args.jobs, len(jobs))) as pool:
+                pool.map(_render_frames_job, jobs)
+        else:
+            for job in jobs:
+                _render_frames_job(job)
+    else:
+        volume_render(args.input[0], args.phong, args.auto_tf, args.progressive, args.log_fps)
@@ -0,0 +1,260 @@
+import vtk
+import argparse
+import multiprocessing
+import os
+import time
+import numpy as np
+from multiprocessing import shared_memory
+from vtk.util import numpy_support
+from task2_Volume_Rendering import setup_color_transfer_function, setup_opacity_transfer_function
+from auto_transfer_function import auto_transfer_functions
+
+BACKGROUND = (0.1, 0.1, 0.1)
+LUT_SIZE = 1024
+
+# Filled in each worker by _init_worker from the shared memory blocks
+_shared = {}
+
+def load_volume(input_file):
+    reader = vtk.vtkXMLImageDataReader()
+    reader.SetFileName(input_file)
+    reader.Update()
+    return reader.GetOutput()
+
+def transfer_function_tables(ctf, otf, vmin, vmax, size=LUT_SIZE):
+    # Sample both transfer functions into flat lookup tables over the data range
+    color = np.zeros(size * 3)
+    ctf.GetTable(vmin, vmax, size, color)
+    opacity = np.zeros(size)
+    otf.GetTable(vmin, vmax, size, opacity)
+    return color.reshape(size, 3).astype(np.float32), opacity.astype(np.float32)
+
+def orbit_camera(bounds, azimuth, elevation):
+    # Orthographic camera looking at the volume centre from the given angles
+    center = np.array([(bounds[0] + bounds[1]) / 2, (bounds[2] + bounds[3]) / 2, (bounds[4] + bounds[5]) / 2])
+    radius = 0.5 * np.linalg.norm([bounds[1] - bounds[0], bounds[3] - bounds[2], bounds[5] - bounds[4]])
+    az, el = np.radians(azimuth), np.radians(elevation)
+    direction = -np.array([np.cos(el) * np.sin(az), np.sin(el), np.cos(el) * np.cos(az)])
+    right = np.cross(direction, [0.0, 1.0, 0.0])
+    if np.linalg.norm(right) < 1e-6:
+        right = np.array([1.0, 0.0, 0.0])
+    right /= np.linalg.norm(right)
+    up = np.cross(right, direction)
+    return center, radius, direction, right, up
+
+def make_tiles(width, height, tile_size):
+    return [(x0, y0, min(x0 + tile_size, width), min(y0 + tile_size, height))
+            for y0 in range(0, height, tile_size)
+            for x0 in range(0, width, tile_size)]
+
+def _attach(name, shape, dtype):
+    block = shared_memory.SharedMemory(name=name)
+    return block, np.ndarray(shape, dtype=dtype, buffer=block.buf)
+
+def _init_worker(volume_spec, color_spec, opacity_spec, params):
+    # Views into the parent's shared memory, no copies per worker
+    for key, spec in (('volume', volume_spec), ('color', color_spec), ('opacity', opacity_spec)):
+        block, array = _attach(*spec)
+        _shared[key + '_block'] = block
+        _shared[key] = array
+    _shared.update(params)
+
+def trilinear(volume, p):
+    # p holds continuous (x, y, z) voxel coordinates, one row per sample
+    nz, ny, nx = volume.shape
+    x = np.clip(p[:, 0], 0, nx - 1.001)
+    y = np.clip(p[:, 1], 0, ny - 1.001)
+    z = np.clip(p[:, 2], 0, max(nz - 1.001, 0))
+    x0, y0, z0 = x.astype(np.int32), y.astype(np.int32), z.astype(np.int32)
+    fx, fy, fz = x - x0, y - y0, z - z0
+    x1, y1, z1 = x0 + 1, y0 + 1, np.minimum(z0 + 1, nz - 1)
+    c00 = volume[z0, y0, x0] * (1 - fx) + volume[z0, y0, x1] * fx
+    c10 = volume[z0, y1, x0] * (1 - fx) + volume[z0, y1, x1] * fx
+    c01 = volume[z1, y0, x0] * (1 - fx) + volume[z1, y0, x1] * fx
+    c11 = volume[z1, y1, x0] * (1 - fx) + volume[z1, y1, x1] * fx
+    return (c00 * (1 - fy) + c10 * fy) * (1 - fz) + (c01 * (1 - fy) + c11 * fy) * fz
+
+def render_tile(tile, pixel_step=1, step_scale=1.0):
+    x0, y0, x1, y1 = tile
+    volume, color, opacity = _shared['volume'], _shared['color'], _shared['opacity']
+    width, height = _shared['width'], _shared['height']
+    origin, spacing = np.asarray(_shared['origin']), np.asarray(_shared['spacing'])
+    center, radius, direction, right, up = (np.asarray(v) for v in _shared['camera'])
+    lo, hi = np.asarray(_shared['bounds'][0::2]), np.asarray(_shared['bounds'][1::2])
+    vmin, vmax = _shared['range']
+    dt = _shared['sample_distance'] * step_scale
+
+    # One orthographic ray per (possibly subsampled) pixel of the tile
+    xs = np.arange(x0, x1, pixel_step)
+    ys = np.arange(y0, y1, pixel_step)
+    px, py = np.meshgrid(xs, ys)
+    u = ((px + 0.5) / width * 2 - 1) * radius
+    v = (1 - (py + 0.5) / height * 2) * radius
+    starts = center - direction * radius + u.reshape(-1, 1) * right + v.reshape(-1, 1) * up
+
+    # Clip each ray against the volume bounding box (slab test)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        inv = 1.0 / np.where(direction == 0, 1e-12, direction)
+    t0 = (lo - starts) * inv
+    t1 = (hi - starts) * inv
+    tnear = np.maximum(np.minimum(t0, t1).max(axis=1), 0.0)
+    tfar = np.maximum(t0, t1).min(axis=1)
+
+    n = len(starts)
+    rgb = np.zeros((n, 3), dtype=np.float32)
+    alpha = np.zeros(n, dtype=np.float32)
+    lut_scale = (len(opacity) - 1) / (vmax - vmin)
+    # Opacity correction relative to vtkVolumeProperty's default unit distance of 1
+    exponent = dt
+
+    active = np.flatnonzero(tnear < tfar)
+    t = tnear.copy()
+    while len(active):
+        pos = starts[active] + t[active, None] * direction
+        values = trilinear(volume, (pos - origin) / spacing)
+        idx = np.clip(((values - vmin) * lut_scale).astype(np.int32), 0, len(opacity) - 1)
+        a = 1.0 - (1.0 - opacity[idx]) ** exponent
+        weight = (1.0 - alpha[active]) * a
+        rgb[active] += weight[:, None] * color[idx]
+        alpha[active] += weight
+
+        t[active] += dt
+        # Early ray termination and exit from the box
+        active = active[(t[active] < tfar[active]) & (alpha[active] < 0.99)]
+
+    rgb += (1.0 - alpha[:, None]) * np.asarray(BACKGROUND, dtype=np.float32)
+    image = (np.clip(rgb, 0, 1) * 255).astype(np.uint8).reshape(len(ys), len(xs), 3)
+    if pixel_step > 1:
+        # Blow subsampled pixels back up to the tile size
+        image = np.repeat(np.repeat(image, pixel_step, axis=0), pixel_step, axis=1)[:y1 - y0, :x1 - x0]
+    return tile, image
+
+def _render_tile_job(job):
+    return render_tile(*job)
+
+def _share(array):
+    block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    view = np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)
+    view[...] = array
+    return block, (block.name, array.shape, array.dtype.str)
+
+class TiledRenderer:
+    def __init__(self, image_data, ctf, otf, workers, width=1000, height=1000,
+                 tile_size=100, azimuth=30.0, elevation=20.0, sample_distance=None):
+        nx, ny, nz = image_data.GetDimensions()
+        volume = numpy_support.vtk_to_numpy(image_data.GetPointData().GetScalars())
+        volume = volume.reshape(nz, ny, nx).astype(np.float32)
+        vmin, vmax = image_data.GetPointData().GetScalars().GetRange()
+        if vmax <= vmin:
+            vmax = vmin + 1.0
+        color, opacity = transfer_function_tables(ctf, otf, vmin, vmax)
+        bounds = image_data.GetBounds()
+        spacing = image_data.GetSpacing()
+
+        self.width, self.height, self.tile_size = width, height, tile_size
+        self._blocks = []
+        specs = []
+        for array in (volume, color, opacity):
+            block, spec = _share(array)
+            self._blocks.append(block)
+            specs.append(spec)
+        self.params = {
+            'width': width,
+            'height': height,
+            'origin': image_data.GetOrigin(),
+            'spacing': spacing,
+            'bounds': bounds,
+            'range': (vmin, vmax),
+            'camera': tuple(np.asarray(v).tolist() for v in orbit_camera(bounds, azimuth, elevation)),
+            'sample_distance': sample_distance or 0.5 * min(spacing),
+        }
+        self.pool = multiprocessing.Pool(workers, initializer=_init_worker,
+                                         initargs=(*specs, self.params))
+
+    def render(self, pixel_step=1, step_scale=1.0):
+        image = np.empty((self.height, self.width, 3), dtype=np.uint8)
+        jobs = [(tile, pixel_step, step_scale)
+                for tile in make_tiles(self.width, self.height, self.tile_size)]
+        # Stitch finished tiles into the frame as they come back
+        for (x0, y0, x1, y1), tile_image in self.pool.imap_unordered(_render_tile_job, jobs):
+            image[y0:y1, x0:x1] = tile_image
+        return image
+
+    def close(self):
+        self.pool.close()
+        self.pool.join()
+        for block in self._blocks:
+            block.close()
+            block.unlink()
+
+def write_png(image, output_file):
+    height, width, _ = image.shape
+    vtk_image = vtk.vtkImageData()
+    vtk_image.SetDimensions(width, height, 1)
+    # VTK images start at the bottom row
+    flat = np.ascontiguousarray(image[::-1]).reshape(-1, 3)
+    vtk_image.GetPointData().SetScalars(numpy_support.numpy_to_vtk(flat, deep=True))
+    writer = vtk.vtkPNGWriter()
+    writer.SetFileName(output_file)
+    writer.SetInputData(vtk_image)
+    writer.Write()
+
+def transfer_functions_for(image_data, auto_tf):
+    if auto_tf:
+        return auto_transfer_functions(image_data)
+    return setup_color_transfer_function(), setup_opacity_transfer_function()
+
+def scaling_report(image_data, ctf, otf, max_workers, repeats, **kwargs):
+    counts = [1]
+    while counts[-1] * 2 < max_workers:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != max_workers:
+        counts.append(max_workers)
+
+    baseline = None
+    print(f"{'workers':>8} {'time (s)':>10} {'speedup':>8} {'efficiency':>10}")
+    for workers in counts:
+        renderer = TiledRenderer(image_data, ctf, otf, workers, **kwargs)
+        renderer.render()  # warm up the pool
+        start = time.perf_counter()
+        for _ in range(repeats):
+            renderer.render()
+        elapsed = (time.perf_counter() - start) / repeats
+        renderer.close()
+        baseline = baseline or elapsed
+        speedup = baseline / elapsed
+        print(f"{workers:>8} {elapsed:>10.3f} {speedup:>8.2f} {speedup / workers:>10.2f}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Tile-parallel CPU ray casting of a VTKImageData volume')
+    parser.add_argument('input', help='Input VTKImageData file (.vti)')
+    parser.add_argument('--output', default='raycast.png', help='Output PNG file (default: raycast.png)')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(),
+                       help='Worker processes (default: all cores)')
+    parser.add_argument('--tile-size', type=int, default=100, help='Tile edge in pixels (default: 100)')
+    parser.add_argument('--size', type=int, default=1000, help='Image width and height (default: 1000)')
+    parser.add_argument('--azimuth', type=float, default=30.0, help='Camera azimuth in degrees (default: 30)')
+    parser.add_argument('--elevation', type=float, default=20.0, help='Camera elevation in degrees (default: 20)')
+    parser.add_argument('--auto-tf', action='store_true',
+                       help='Use histogram-driven transfer functions instead of the fixed Isabel ones')
+    parser.add_argument('--scaling', action='store_true',
+                       help='Report render time and speedup from 1 to --workers processes')
+    parser.add_argument('--repeats', type=int, default=3, help='Frames timed per worker count (default: 3)')
+
+    args = parser.parse_args()
+
+    image_data = load_volume(args.input)
+    ctf, otf = transfer_functions_for(image_data, args.auto_tf)
+    options = dict(width=args.size, height=args.size, tile_size=args.tile_size,
+                   azimuth=args.azimuth, elevation=args.elevation)
+
+    if args.scaling:
+        scaling_report(image_data, ctf, otf, args.workers, args.repeats, **options)
+    else:
+        renderer = TiledRenderer(image_data, ctf, otf, args.workers, **options)
+        start = time.perf_counter()
+        image = renderer.render()
+        print(f"Rendered {args.size}x{args.size} with {args.workers} workers "
+              f"in {time.perf_counter() - start:.3f} s")
+        renderer.close()
+        write_png(image, args.output)
@@ -0,0 +1,103 @@
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from contour_spectrum import corner_views
+from marching_cubes import marching_cubes, march_blocks
+
+
+class BrickIndex:
+    # Min/max of every brick of `brick`^3 cells, built once per volume. A brick can
+    # only produce triangles when min < isovalue <= max (a cell is cut when some but
+    # not all of its corners are >= the isovalue), so extraction runs marching cubes
+    # over those bricks only and never touches the rest of the grid.
+    # Extraction cost follows the number of triangles more than the number of cells,
+    # and bricks duplicate the vertices on their faces, so once more than `dense` of
+    # the bricks are active a single whole-volume pass is cheaper and is used instead.
+    def __init__(self, grid, brick=8, origin=(0.0, 0.0, 0.0), spacing=(1.0, 1.0, 1.0), workers=4,
+                 dense=0.15):
+        self.grid = np.asarray(grid, dtype=np.float32)
+        self.brick = brick
+        self.origin = np.asarray(origin, dtype=np.float32)
+        self.spacing = np.asarray(spacing, dtype=np.float32)
+        corners = corner_views(self.grid)
+        cell_min = np.minimum.reduce(corners)
+        cell_max = np.maximum.reduce(corners)
+        for axis in range(3):
+            starts = np.arange(0, cell_min.shape[axis], brick)
+            cell_min = np.minimum.reduceat(cell_min, starts, axis=axis)
+            cell_max = np.maximum.reduceat(cell_max, starts, axis=axis)
+        self.brick_min = cell_min
+        self.brick_max = cell_max
+        self.shape = cell_min.shape
+        self.workers = workers
+        self.dense = dense
+        self._executor = ThreadPoolExecutor(max_workers=workers)
+
+    @property
+    def count(self):
+        return self.brick_min.size
+
+    def active(self, iso):
+        # (i, j, k) brick indices whose value range contains the isovalue
+        return np.argwhere((self.brick_min < iso) & (iso <= self.brick_max))
+
+    def skipped(self, iso):
+        return 1.0 - len(self.active(iso)) / self.count
+
+    def _gather(self, indices):
+        # Cells [start, start + brick) need points [start, start + brick]; bricks on
+        # the far faces of the volume can be smaller
+        starts = indices * self.brick
+        groups = {}
+        for start in starts:
+            block = self.grid[tuple(slice(s, s + self.brick + 1) for s in start)]
+            blocks, block_starts = groups.setdefault(block.shape, ([], []))
+            blocks.append(block)
+            block_starts.append(start)
+        return [(np.stack(blocks), np.array(block_starts))
+                for blocks, block_starts in groups.values()]
+
+    def _march(self, job, iso):
+        blocks, starts = job
+        vertices, edges, faces = march_blocks(blocks, iso)
+        # Back to volume grid indices, and a key for the grid edge each vertex lies on:
+        # both copies of a vertex on a face shared by two bricks get the same key
+        block_starts = starts[edges[:, 0]]
+        vertices += block_starts.astype(np.float32)
+        i, j, k = (edges[:, 2:] + block_starts).T
+        nx, ny, nz = self.grid.shape
+        keys = ((edges[:, 1] * nx + i) * ny + j) * nz + k
+        return vertices, keys, faces
+
+    def extract(self, iso):
+        # Marching cubes over the active bricks only, split across the worker threads,
+        # then welded into one mesh
+        active = self.active(iso)
+        if len(active) > self.dense * self.count:
+            return marching_cubes(self.grid, iso, self.origin, self.spacing)
+        chunks = np.array_split(active, min(self.workers, max(len(active), 1)))
+        jobs = [job for chunk in chunks if len(chunk) for job in self._gather(chunk)]
+        parts = [part for part in self._executor.map(lambda job: self._march(job, iso), jobs)
+                 if len(part[2])]
+        if not parts:
+            return np.zeros((0, 3), dtype=np.float32), np.zeros((0, 3), dtype=np.int32)
+        offsets = np.cumsum([0] + [len(v) for v, _, _ in parts[:-1]])
+        vertices = np.concatenate([v for v, _, _ in parts])
+        keys = np.concatenate([k for _, k, _ in parts])
+        faces = np.concatenate([f + offset for (_, _, f), offset in zip(parts, offsets)])
+
+        # Merge the copies of each vertex on brick faces, keeping first-seen order
+        _, first, labels = np.unique(keys, return_index=True, return_inverse=True)
+        order = np.argsort(first)
+        remap = np.empty_like(order)
+        remap[order] = np.arange(len(order))
+        vertices = vertices[first[order]]
+        faces = remap[labels.ravel()][faces].astype(np.int32)
+        return vertices * self.spacing + self.origin, faces
+
+    def summary(self, iso):
+        active = len(self.active(iso))
+        return (f"bricks: {active}/{self.count} active, {1 - active / self.count:.0%} skipped "
+                f"({self.brick}^3 cells each)")
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
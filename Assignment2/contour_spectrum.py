@@ -0,0 +1,81 @@
+import numpy as np
+from scipy import ndimage
+
+# Mean marching-cubes triangles per active cell on smooth fields (mixture.vti: 1.97)
+TRIANGLES_PER_CELL = 2.0
+# Connectivity that matches the marching-cubes case table: the >= side joins across
+# faces only, the < side across faces and edges
+SUPER_STRUCTURE = ndimage.generate_binary_structure(3, 1)
+SUB_STRUCTURE = ndimage.generate_binary_structure(3, 2)
+
+
+def corner_views(grid):
+    # The 8 corner samples of every cell as (nx-1, ny-1, nz-1) views
+    nx, ny, nz = grid.shape
+    return [grid[dx:nx - 1 + dx, dy:ny - 1 + dy, dz:nz - 1 + dz]
+            for dz in (0, 1) for dy in (0, 1) for dx in (0, 1)]
+
+
+class ContourSpectrum:
+    # Isosurface area, triangle count and component count as functions of the
+    # isovalue, without extracting any surface. Area and triangles come from one pass
+    # over the cells: cells enter the sweep at their min and leave it at their max, so
+    # with the endpoints sorted any isovalue is two binary searches.
+    def __init__(self, grid, spacing=(1.0, 1.0, 1.0)):
+        grid = np.asarray(grid, dtype=np.float32)
+        corners = corner_views(grid)
+        cell_min = np.minimum.reduce(corners).ravel()
+        cell_max = np.maximum.reduce(corners).ravel()
+
+        # Area: a cell with gradient g and value range r contributes V |g| / r per
+        # unit isovalue while the isovalue is inside its range (coarea formula)
+        sx, sy, sz = spacing
+        c = corners
+        gx = ((c[1] - c[0]) + (c[3] - c[2]) + (c[5] - c[4]) + (c[7] - c[6])) / (4 * sx)
+        gy = ((c[2] - c[0]) + (c[3] - c[1]) + (c[6] - c[4]) + (c[7] - c[5])) / (4 * sy)
+        gz = ((c[4] - c[0]) + (c[5] - c[1]) + (c[6] - c[2]) + (c[7] - c[3])) / (4 * sz)
+        span = cell_max - cell_min
+        weight = np.zeros_like(span)
+        nonflat = span > 0
+        weight[nonflat] = (sx * sy * sz * np.sqrt(gx ** 2 + gy ** 2 + gz ** 2).ravel()[nonflat]
+                           / span[nonflat])
+
+        by_min = np.argsort(cell_min, kind='stable')
+        by_max = np.argsort(cell_max, kind='stable')
+        self.cell_min = cell_min[by_min]
+        self.cell_max = cell_max[by_max]
+        self.area_in = np.concatenate([[0.0], np.cumsum(weight[by_min], dtype=np.float64)])
+        self.area_out = np.concatenate([[0.0], np.cumsum(weight[by_max], dtype=np.float64)])
+        self.grid = grid
+
+    def active_cells(self, iso):
+        iso = np.asarray(iso)
+        return (np.searchsorted(self.cell_min, iso, side='right')
+                - np.searchsorted(self.cell_max, iso, side='right'))
+
+    def area(self, iso):
+        iso = np.asarray(iso)
+        return (self.area_in[np.searchsorted(self.cell_min, iso, side='right')]
+                - self.area_out[np.searchsorted(self.cell_max, iso, side='right')])
+
+    def triangles(self, iso):
+        return np.rint(self.active_cells(iso) * TRIANGLES_PER_CELL).astype(np.int64)
+
+    def components(self, isovalues):
+        # Each surface component separates a component of {f >= iso} from one of
+        # {f < iso}; their counts give b0(super) + b0(sub) - 1, exact on mixture.vti
+        counts = []
+        for iso in np.atleast_1d(isovalues):
+            above = self.grid >= iso
+            if above.all() or not above.any():
+                counts.append(0)
+                continue
+            n_super = ndimage.label(above, SUPER_STRUCTURE)[1]
+            n_sub = ndimage.label(~above, SUB_STRUCTURE)[1]
+            counts.append(n_super + n_sub - 1)
+        return np.array(counts)
+
+    def sample(self, isovalues):
+        isovalues = np.asarray(isovalues)
+        return dict(isovalue=isovalues, area=self.area(isovalues),
+                    triangles=self.triangles(isovalues), components=self.components(isovalues))
@@ -0,0 +1,92 @@
+import numpy as np
+
+
+# Upper triangle of a symmetric 4x4 quadric, and how to expand it back
+QUADRIC_ROWS, QUADRIC_COLS = np.triu_indices(4)
+QUADRIC_FULL = np.zeros((4, 4), dtype=np.int64)
+QUADRIC_FULL[QUADRIC_ROWS, QUADRIC_COLS] = np.arange(10)
+QUADRIC_FULL[QUADRIC_COLS, QUADRIC_ROWS] = np.arange(10)
+
+
+def face_quadrics(vertices, faces):
+    # Area-weighted plane quadric of every triangle, as the 10 unique entries
+    v0, v1, v2 = (vertices[faces[:, i]].astype(np.float64) for i in range(3))
+    normals = np.cross(v1 - v0, v2 - v0)
+    double_area = np.linalg.norm(normals, axis=1)
+    normals /= np.maximum(double_area, 1e-30)[:, None]
+    planes = np.concatenate([normals, -np.einsum('ij,ij->i', normals, v0)[:, None]], axis=1)
+    return (0.5 * double_area)[:, None] * planes[:, QUADRIC_ROWS] * planes[:, QUADRIC_COLS]
+
+
+def cluster_cells(vertices, lo, cell, resolution):
+    # Grid cell of every vertex, as (x, y, z) indices and a flat id
+    ijk = np.minimum(((vertices - lo) / cell).astype(np.int64), resolution - 1)
+    return ijk, (ijk[:, 0] * resolution + ijk[:, 1]) * resolution + ijk[:, 2]
+
+
+def collapsed(faces, labels):
+    merged = labels[faces]
+    keep = (merged[:, 0] != merged[:, 1]) & (merged[:, 1] != merged[:, 2]) & (merged[:, 0] != merged[:, 2])
+    return merged[keep]
+
+
+def decimate(vertices, faces, target_triangles, iterations=6):
+    # Quadric-error vertex clustering: vertices are merged per cell of a uniform grid
+    # and each cluster is placed at the point minimising the summed plane quadrics of
+    # its triangles, clamped to its cell. The grid resolution is bisected to stay
+    # within target_triangles.
+    if len(faces) <= target_triangles:
+        return vertices, faces
+    lo = vertices.min(axis=0)
+    extent = float((vertices.max(axis=0) - lo).max()) or 1.0
+
+    # Surface triangle counts grow roughly with resolution squared; start the search
+    # around the resolution that matches the current mean edge length
+    edge = np.linalg.norm(vertices[faces[:, 0]] - vertices[faces[:, 1]], axis=1).mean()
+    guess = max(extent / max(edge, 1e-12) * np.sqrt(target_triangles / len(faces)), 2.0)
+    low, high = max(int(guess / 2), 1), int(guess * 2) + 2
+    best = None
+    for _ in range(iterations):
+        if high - low <= 1:
+            break
+        resolution = (low + high) // 2
+        _, ids = cluster_cells(vertices, lo, extent / resolution * (1 + 1e-6), resolution)
+        if len(collapsed(faces, ids)) <= target_triangles:
+            low, best = resolution, resolution
+        else:
+            high = resolution
+    resolution = best or low
+    cell = extent / resolution * (1 + 1e-6)
+    ijk, ids = cluster_cells(vertices, lo, cell, resolution)
+    cells, first, labels = np.unique(ids, return_index=True, return_inverse=True)
+    clusters = len(cells)
+    merged = collapsed(faces, labels)
+    # Same triangle in any rotation counts once; keep the first winding seen
+    _, unique_rows = np.unique(np.sort(merged, axis=1), axis=0, return_index=True)
+    merged = merged[np.sort(unique_rows)]
+
+    # Sum the quadrics of each cluster's incident triangles
+    quadrics = face_quadrics(vertices, faces)
+    corner_labels = labels[faces].ravel()
+    repeated = np.repeat(quadrics, 3, axis=0)
+    summed = np.stack([np.bincount(corner_labels, weights=repeated[:, entry], minlength=clusters)
+                       for entry in range(10)], axis=1)[:, QUADRIC_FULL]
+
+    # Minimise each quadric, regularised towards the cluster centroid so flat or
+    # degenerate clusters stay put, then keep the result inside the cluster's cell
+    counts = np.bincount(labels, minlength=clusters)[:, None]
+    centroids = np.stack([np.bincount(labels, weights=vertices[:, i], minlength=clusters)
+                          for i in range(3)], axis=1) / counts
+    scale = np.abs(summed[:, :3, :3]).max(axis=(1, 2), keepdims=True)
+    reg = 1e-3 * np.maximum(scale, 1e-12)
+    a = summed[:, :3, :3] + reg * np.eye(3)
+    b = -summed[:, :3, 3] + reg[:, :, 0] * centroids
+    positions = np.linalg.solve(a, b[:, :, None])[:, :, 0]
+    cell_lo = lo + ijk[first] * cell
+    positions = np.clip(positions, cell_lo, cell_lo + cell)
+
+    # Keep only clusters that still carry a triangle
+    used = np.unique(merged)
+    remap = np.full(clusters, -1, dtype=np.int64)
+    remap[used] = np.arange(len(used))
+    return positions[used].astype(np.float32), remap[merged].astype(np.int32)
@@ -0,0 +1,236 @@
+# =========================
+# Isosurface Explorer (Dash)
+# =========================
+# Multi-user version of the Assignment2 notebook explorer. The volume, brick index,
+# sorted values and mesh cache live once in the server process and every browser
+# session reads from them, so a mesh extracted for one viewer is a cache hit for all
+# the others. Run it with threads rather than worker processes so the cache is shared:
+#
+#   python isosurface_dash.py                                   (threaded dev server)
+#   gunicorn isosurface_dash:server --workers 1 --threads 32    (deployment)
+#   python isosurface_dash.py --load-test 1 8 32 [--warm]       (concurrent viewers benchmark)
+
+import argparse
+import os
+import threading
+import time
+from collections import deque
+import numpy as np
+import dash
+from dash import dcc, html, Input, Output, Patch, ctx
+import plotly.graph_objects as go
+from plotly.colors import sample_colorscale
+from volume_data import Volume, SortedValues, typed_array, mesh3d_payload
+from brick_index import BrickIndex
+from mesh_cache import MeshCache
+from decimate import decimate
+
+VTI_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "mixture.vti")
+STEPS = 200                 # slider positions, one cache slot each
+PREVIEW_TRIANGLES = 20000   # triangle budget of the mesh sent while dragging
+HIST_BINS = 60
+BAND = 0.25                 # histogram shows values within +- BAND of the isovalue
+
+# =========================
+# Shared state (all sessions)
+# =========================
+
+volume = Volume.from_vti(VTI_FILE)
+data_min, data_max = volume.range
+bricks = BrickIndex(volume.grid, brick=8, origin=volume.origin, spacing=volume.spacing)
+sorted_values = SortedValues(volume.values)
+
+
+def extract_mesh(iso):
+    verts, faces = bricks.extract(iso)
+    t0 = time.perf_counter()
+    small_verts, small_faces = decimate(verts, faces, PREVIEW_TRIANGLES)
+    decimate_ms = (time.perf_counter() - t0) * 1000
+    return dict(full=mesh3d_payload(verts, faces),
+                preview=mesh3d_payload(small_verts, small_faces),
+                triangles=len(faces), preview_triangles=len(small_faces),
+                decimate_ms=decimate_ms, skipped=bricks.skipped(iso))
+
+
+mesh_cache = MeshCache(extract_mesh, data_min, data_max, steps=STEPS, max_bytes=448e6)
+
+# Server-side time of every slider callback, for the status line and the load test
+callback_ms = deque(maxlen=2000)
+callback_lock = threading.Lock()
+
+
+def iso_color(iso):
+    return sample_colorscale('Plasma', [(iso - data_min) / (data_max - data_min)])[0]
+
+
+def histogram_bars(iso):
+    lo, hi = max(iso - BAND, data_min), min(iso + BAND, data_max)
+    centers, counts, width = sorted_values.histogram(lo, hi, HIST_BINS)
+    return dict(x=typed_array(centers), y=typed_array(counts), width=width)
+
+
+def iso_figure(iso):
+    entry = mesh_cache.get(iso)
+    fig = go.Figure(go.Mesh3d(**entry['full'], color=iso_color(iso), flatshading=False))
+    # uirevision keeps each viewer's camera when the mesh is swapped
+    fig.update_layout(title="Isosurface", margin=dict(l=0, r=0, b=0, t=30), uirevision='iso')
+    return fig
+
+
+def hist_figure(iso):
+    fig = go.Figure(go.Bar(**histogram_bars(iso),
+                           marker=dict(color='lightblue', line=dict(color='black', width=1))))
+    fig.update_layout(title="Value Histogram", xaxis_title=f"Values in [{iso-BAND:.2f}, {iso+BAND:.2f}]",
+                      yaxis_title="Count", bargap=0, uirevision='hist')
+    return fig
+
+
+def status_text():
+    with callback_lock:
+        ms = np.array(callback_ms)
+    latency = (f"{len(ms)} slider callbacks, p50 {np.percentile(ms, 50):.1f} ms, "
+               f"p95 {np.percentile(ms, 95):.1f} ms" if len(ms) else "no slider callbacks yet")
+    return f"{mesh_cache.summary()} | {latency}"
+
+# =========================
+# Layout
+# =========================
+
+app = dash.Dash(__name__)
+app.title = "Isosurface Explorer"
+server = app.server
+
+app.layout = html.Div([
+    html.H3("Isosurface Explorer", style={'fontFamily': 'sans-serif'}),
+    html.Div([
+        dcc.Graph(id='iso-graph', figure=iso_figure(0.0), style={'width': '60%', 'height': '600px'}),
+        dcc.Graph(id='hist-graph', figure=hist_figure(0.0), style={'width': '40%', 'height': '600px'}),
+    ], style={'display': 'flex'}),
+    html.Div([
+        html.Div(dcc.Slider(id='iso-slider', min=data_min, max=data_max, step=mesh_cache.step, value=0.0,
+                            marks=None, tooltip={'placement': 'bottom', 'always_visible': True}),
+                 style={'flex': '1'}),
+        html.Button('Reset', id='reset-btn', n_clicks=0, style={'margin': '0px 10px'}),
+    ], style={'display': 'flex', 'alignItems': 'center'}),
+    html.Div(id='lod-label', style={'fontFamily': 'monospace'}),
+    html.Div(id='cache-label', style={'fontFamily': 'monospace'}),
+    dcc.Interval(id='status-interval', interval=2000),
+])
+
+# =========================
+# Callbacks
+# =========================
+
+@app.callback(
+    [Output('iso-graph', 'figure'),
+     Output('hist-graph', 'figure'),
+     Output('lod-label', 'children')],
+    [Input('iso-slider', 'drag_value'),
+     Input('iso-slider', 'value')],
+    prevent_initial_call=True
+)
+def update_plots(drag_value, value):
+    # Decimated preview while the handle is dragged, full mesh once it is released.
+    # Only the changed trace properties are sent (Patch), never the whole figure.
+    t0 = time.perf_counter()
+    dragging = ('iso-slider.drag_value' in ctx.triggered_prop_ids
+                and drag_value is not None and drag_value != value)
+    iso = drag_value if dragging else value
+    level = 'preview' if dragging else 'full'
+    if not dragging:
+        mesh_cache.prefetch(iso)   # re-centre the background fill on the settled value
+    entry = mesh_cache.get(iso)
+
+    mesh = Patch()
+    mesh['data'][0].update(dict(entry[level], color=iso_color(iso)))
+    hist = Patch()
+    hist['data'][0].update(histogram_bars(iso))
+    hist['layout']['xaxis']['title']['text'] = f"Values in [{iso-BAND:.2f}, {iso+BAND:.2f}]"
+    label = (f"{level} mesh: {entry['triangles']:,} triangles, preview {entry['preview_triangles']:,} "
+             f"(decimated in {entry['decimate_ms']:.1f} ms), {entry['skipped']:.0%} of bricks skipped")
+    with callback_lock:
+        callback_ms.append((time.perf_counter() - t0) * 1000)
+    return mesh, hist, label
+
+
+@app.callback(
+    Output('iso-slider', 'value'),
+    Input('reset-btn', 'n_clicks'),
+    prevent_initial_call=True
+)
+def reset(_):
+    return 0.0
+
+
+@app.callback(
+    Output('cache-label', 'children'),
+    Input('status-interval', 'n_intervals')
+)
+def update_status(_):
+    return status_text()
+
+# =========================
+# Load test
+# =========================
+
+def load_test(viewers, moves=40, seed=0):
+    # `viewers` threads each replay `moves` slider releases through the real Dash
+    # callback endpoint (routing, callback, JSON encoding), as separate sessions would
+    body_outputs = [dict(id='iso-graph', property='figure'), dict(id='hist-graph', property='figure'),
+                    dict(id='lod-label', property='children')]
+    output = '..' + '...'.join(f"{o['id']}.{o['property']}" for o in body_outputs) + '..'
+    rng = np.random.default_rng(seed)
+    paths = [mesh_cache.isovalue(rng.integers(0, STEPS + 1, moves)) for _ in range(viewers)]
+    latencies, failures, nbytes = [], [], []
+    lock = threading.Lock()
+
+    def viewer(isovalues):
+        client = server.test_client()
+        for iso in isovalues:
+            payload = dict(output=output, outputs=body_outputs, changedPropIds=['iso-slider.value'],
+                           inputs=[dict(id='iso-slider', property='drag_value', value=float(iso)),
+                                   dict(id='iso-slider', property='value', value=float(iso))])
+            t0 = time.perf_counter()
+            response = client.post('/_dash-update-component', json=payload)
+            ms = (time.perf_counter() - t0) * 1000
+            with lock:
+                latencies.append(ms)
+                nbytes.append(len(response.data))
+                if response.status_code != 200:
+                    failures.append(response.status_code)
+
+    threads = [threading.Thread(target=viewer, args=(path,)) for path in paths]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    seconds = time.perf_counter() - start
+    ms = np.array(latencies)
+    print(f"{viewers:3d} viewers: {len(ms) / seconds:6.1f} updates/s, latency p50 {np.percentile(ms, 50):7.1f} ms, "
+          f"p95 {np.percentile(ms, 95):7.1f} ms, {np.mean(nbytes) / 1e6:.2f} MB per response, "
+          f"{len(failures)} failed")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Multi-user isosurface explorer")
+    parser.add_argument('--port', type=int, default=8050)
+    parser.add_argument('--load-test', type=int, nargs='+', metavar='VIEWERS',
+                        help="benchmark concurrent viewers instead of serving")
+    parser.add_argument('--warm', action='store_true',
+                        help="fill the mesh cache for every slider position before starting")
+    args = parser.parse_args()
+
+    mesh_cache.prefetch(0.0)   # background fill, nearest isovalues first
+    if args.warm:
+        t0 = time.perf_counter()
+        for key in range(STEPS + 1):
+            mesh_cache.get(mesh_cache.isovalue(key))
+        print(f"Mesh cache warmed in {time.perf_counter() - t0:.1f} s: {mesh_cache.summary()}")
+    if args.load_test:
+        for viewers in args.load_test:
+            load_test(viewers)
+        print(mesh_cache.summary())
+    else:
+        # One process, many threads: every session shares the cache above
+        app.run(debug=False, port=args.port, threaded=True)
@@ -0,0 +1,364 @@
+import numpy as np
+
+# Cube corner (x, y, z) offsets and the corner pair of each of the 12 cube edges,
+# in the same ordering as vtkMarchingCubes
+CORNER_OFFSETS = np.array([(0, 0, 0), (1, 0, 0), (1, 1, 0), (0, 1, 0),
+                           (0, 0, 1), (1, 0, 1), (1, 1, 1), (0, 1, 1)])
+EDGE_CORNERS = [(0, 1), (1, 2), (3, 2), (0, 3), (4, 5), (5, 6),
+                (7, 6), (4, 7), (0, 4), (1, 5), (3, 7), (2, 6)]
+# Axis each edge runs along and the offset of its lower corner
+EDGE_AXIS = np.array([np.argmax(CORNER_OFFSETS[b] - CORNER_OFFSETS[a]) for a, b in EDGE_CORNERS])
+EDGE_START = np.array([CORNER_OFFSETS[a] for a, _ in EDGE_CORNERS])
+
+# Triangles (as edge triples) for each of the 256 corner cases; bit i is set when
+# corner i is >= the isovalue. Generated from vtkMarchingCubes.
+TRI_TABLE = [
+    [],
+    [0, 3, 8],
+    [0, 9, 1],
+    [1, 3, 8, 9, 1, 8],
+    [1, 11, 2],
+    [0, 3, 8, 1, 11, 2],
+    [9, 11, 2, 0, 9, 2],
+    [2, 3, 8, 2, 8, 11, 11, 8, 9],
+    [3, 2, 10],
+    [0, 2, 10, 8, 0, 10],
+    [1, 0, 9, 2, 10, 3],
+    [1, 2, 10, 1, 10, 9, 9, 10, 8],
+    [3, 1, 11, 10, 3, 11],
+    [0, 1, 11, 0, 11, 8, 8, 11, 10],
+    [3, 0, 9, 3, 9, 10, 10, 9, 11],
+    [9, 11, 8, 11, 10, 8],
+    [4, 8, 7],
+    [4, 0, 3, 7, 4, 3],
+    [0, 9, 1, 8, 7, 4],
+    [4, 9, 1, 4, 1, 7, 7, 1, 3],
+    [1, 11, 2, 8, 7, 4],
+    [3, 7, 4, 3, 4, 0, 1, 11, 2],
+    [9, 11, 2, 9, 2, 0, 8, 7, 4],
+    [2, 9, 11, 2, 7, 9, 2, 3, 7, 7, 4, 9],
+    [8, 7, 4, 3, 2, 10],
+    [10, 7, 4, 10, 4, 2, 2, 4, 0],
+    [9, 1, 0, 8, 7, 4, 2, 10, 3],
+    [4, 10, 7, 9, 10, 4, 9, 2, 10, 9, 1, 2],
+    [3, 1, 11, 3, 11, 10, 7, 4, 8],
+    [1, 11, 10, 1, 10, 4, 1, 4, 0, 7, 4, 10],
+    [4, 8, 7, 9, 10, 0, 9, 11, 10, 10, 3, 0],
+    [4, 10, 7, 4, 9, 10, 9, 11, 10],
+    [9, 4, 5],
+    [9, 4, 5, 0, 3, 8],
+    [0, 4, 5, 1, 0, 5],
+    [8, 4, 5, 8, 5, 3, 3, 5, 1],
+    [1, 11, 2, 9, 4, 5],
+    [3, 8, 0, 1, 11, 2, 4, 5, 9],
+    [5, 11, 2, 5, 2, 4, 4, 2, 0],
+    [2, 5, 11, 3, 5, 2, 3, 4, 5, 3, 8, 4],
+    [9, 4, 5, 2, 10, 3],
+    [0, 2, 10, 0, 10, 8, 4, 5, 9],
+    [0, 4, 5, 0, 5, 1, 2, 10, 3],
+    [2, 5, 1, 2, 8, 5, 2, 10, 8, 4, 5, 8],
+    [11, 10, 3, 11, 3, 1, 9, 4, 5],
+    [4, 5, 9, 0, 1, 8, 8, 1, 11, 8, 11, 10],
+    [5, 0, 4, 5, 10, 0, 5, 11, 10, 10, 3, 0],
+    [5, 8, 4, 5, 11, 8, 11, 10, 8],
+    [9, 8, 7, 5, 9, 7],
+    [9, 0, 3, 9, 3, 5, 5, 3, 7],
+    [0, 8, 7, 0, 7, 1, 1, 7, 5],
+    [1, 3, 5, 3, 7, 5],
+    [9, 8, 7, 9, 7, 5, 11, 2, 1],
+    [11, 2, 1, 9, 0, 5, 5, 0, 3, 5, 3, 7],
+    [8, 2, 0, 8, 5, 2, 8, 7, 5, 11, 2, 5],
+    [2, 5, 11, 2, 3, 5, 3, 7, 5],
+    [7, 5, 9, 7, 9, 8, 3, 2, 10],
+    [9, 7, 5, 9, 2, 7, 9, 0, 2, 2, 10, 7],
+    [2, 10, 3, 0, 8, 1, 1, 8, 7, 1, 7, 5],
+    [10, 1, 2, 10, 7, 1, 7, 5, 1],
+    [9, 8, 5, 8, 7, 5, 11, 3, 1, 11, 10, 3],
+    [5, 0, 7, 5, 9, 0, 7, 0, 10, 1, 11, 0, 10, 0, 11],
+    [10, 0, 11, 10, 3, 0, 11, 0, 5, 8, 7, 0, 5, 0, 7],
+    [10, 5, 11, 7, 5, 10],
+    [11, 5, 6],
+    [0, 3, 8, 5, 6, 11],
+    [9, 1, 0, 5, 6, 11],
+    [1, 3, 8, 1, 8, 9, 5, 6, 11],
+    [1, 5, 6, 2, 1, 6],
+    [1, 5, 6, 1, 6, 2, 3, 8, 0],
+    [9, 5, 6, 9, 6, 0, 0, 6, 2],
+    [5, 8, 9, 5, 2, 8, 5, 6, 2, 3, 8, 2],
+    [2, 10, 3, 11, 5, 6],
+    [10, 8, 0, 10, 0, 2, 11, 5, 6],
+    [0, 9, 1, 2, 10, 3, 5, 6, 11],
+    [5, 6, 11, 1, 2, 9, 9, 2, 10, 9, 10, 8],
+    [6, 10, 3, 6, 3, 5, 5, 3, 1],
+    [0, 10, 8, 0, 5, 10, 0, 1, 5, 5, 6, 10],
+    [3, 6, 10, 0, 6, 3, 0, 5, 6, 0, 9, 5],
+    [6, 9, 5, 6, 10, 9, 10, 8, 9],
+    [5, 6, 11, 4, 8, 7],
+    [4, 0, 3, 4, 3, 7, 6, 11, 5],
+    [1, 0, 9, 5, 6, 11, 8, 7, 4],
+    [11, 5, 6, 1, 7, 9, 1, 3, 7, 7, 4, 9],
+    [6, 2, 1, 6, 1, 5, 4, 8, 7],
+    [1, 5, 2, 5, 6, 2, 3, 4, 0, 3, 7, 4],
+    [8, 7, 4, 9, 5, 0, 0, 5, 6, 0, 6, 2],
+    [7, 9, 3, 7, 4, 9, 3, 9, 2, 5, 6, 9, 2, 9, 6],
+    [3, 2, 10, 7, 4, 8, 11, 5, 6],
+    [5, 6, 11, 4, 2, 7, 4, 0, 2, 2, 10, 7],
+    [0, 9, 1, 4, 8, 7, 2, 10, 3, 5, 6, 11],
+    [9, 1, 2, 9, 2, 10, 9, 10, 4, 7, 4, 10, 5, 6, 11],
+    [8, 7, 4, 3, 5, 10, 3, 1, 5, 5, 6, 10],
+    [5, 10, 1, 5, 6, 10, 1, 10, 0, 7, 4, 10, 0, 10, 4],
+    [0, 9, 5, 0, 5, 6, 0, 6, 3, 10, 3, 6, 8, 7, 4],
+    [6, 9, 5, 6, 10, 9, 4, 9, 7, 7, 9, 10],
+    [11, 9, 4, 6, 11, 4],
+    [4, 6, 11, 4, 11, 9, 0, 3, 8],
+    [11, 1, 0, 11, 0, 6, 6, 0, 4],
+    [8, 1, 3, 8, 6, 1, 8, 4, 6, 6, 11, 1],
+    [1, 9, 4, 1, 4, 2, 2, 4, 6],
+    [3, 8, 0, 1, 9, 2, 2, 9, 4, 2, 4, 6],
+    [0, 4, 2, 4, 6, 2],
+    [8, 2, 3, 8, 4, 2, 4, 6, 2],
+    [11, 9, 4, 11, 4, 6, 10, 3, 2],
+    [0, 2, 8, 2, 10, 8, 4, 11, 9, 4, 6, 11],
+    [3, 2, 10, 0, 6, 1, 0, 4, 6, 6, 11, 1],
+    [6, 1, 4, 6, 11, 1, 4, 1, 8, 2, 10, 1, 8, 1, 10],
+    [9, 4, 6, 9, 6, 3, 9, 3, 1, 10, 3, 6],
+    [8, 1, 10, 8, 0, 1, 10, 1, 6, 9, 4, 1, 6, 1, 4],
+    [3, 6, 10, 3, 0, 6, 0, 4, 6],
+    [6, 8, 4, 10, 8, 6],
+    [7, 6, 11, 7, 11, 8, 8, 11, 9],
+    [0, 3, 7, 0, 7, 11, 0, 11, 9, 6, 11, 7],
+    [11, 7, 6, 1, 7, 11, 1, 8, 7, 1, 0, 8],
+    [11, 7, 6, 11, 1, 7, 1, 3, 7],
+    [1, 6, 2, 1, 8, 6, 1, 9, 8, 8, 7, 6],
+    [2, 9, 6, 2, 1, 9, 6, 9, 7, 0, 3, 9, 7, 9, 3],
+    [7, 0, 8, 7, 6, 0, 6, 2, 0],
+    [7, 2, 3, 6, 2, 7],
+    [2, 10, 3, 11, 8, 6, 11, 9, 8, 8, 7, 6],
+    [2, 7, 0, 2, 10, 7, 0, 7, 9, 6, 11, 7, 9, 7, 11],
+    [1, 0, 8, 1, 8, 7, 1, 7, 11, 6, 11, 7, 2, 10, 3],
+    [10, 1, 2, 10, 7, 1, 11, 1, 6, 6, 1, 7],
+    [8, 6, 9, 8, 7, 6, 9, 6, 1, 10, 3, 6, 1, 6, 3],
+    [0, 1, 9, 10, 7, 6],
+    [7, 0, 8, 7, 6, 0, 3, 0, 10, 10, 0, 6],
+    [7, 6, 10],
+    [7, 10, 6],
+    [3, 8, 0, 10, 6, 7],
+    [0, 9, 1, 10, 6, 7],
+    [8, 9, 1, 8, 1, 3, 10, 6, 7],
+    [11, 2, 1, 6, 7, 10],
+    [1, 11, 2, 3, 8, 0, 6, 7, 10],
+    [2, 0, 9, 2, 9, 11, 6, 7, 10],
+    [6, 7, 10, 2, 3, 11, 11, 3, 8, 11, 8, 9],
+    [7, 3, 2, 6, 7, 2],
+    [7, 8, 0, 7, 0, 6, 6, 0, 2],
+    [2, 6, 7, 2, 7, 3, 0, 9, 1],
+    [1, 2, 6, 1, 6, 8, 1, 8, 9, 8, 6, 7],
+    [11, 6, 7, 11, 7, 1, 1, 7, 3],
+    [11, 6, 7, 1, 11, 7, 1, 7, 8, 1, 8, 0],
+    [0, 7, 3, 0, 11, 7, 0, 9, 11, 6, 7, 11],
+    [7, 11, 6, 7, 8, 11, 8, 9, 11],
+    [6, 4, 8, 10, 6, 8],
+    [3, 10, 6, 3, 6, 0, 0, 6, 4],
+    [8, 10, 6, 8, 6, 4, 9, 1, 0],
+    [9, 6, 4, 9, 3, 6, 9, 1, 3, 10, 6, 3],
+    [6, 4, 8, 6, 8, 10, 2, 1, 11],
+    [1, 11, 2, 3, 10, 0, 0, 10, 6, 0, 6, 4],
+    [4, 8, 10, 4, 10, 6, 0, 9, 2, 2, 9, 11],
+    [11, 3, 9, 11, 2, 3, 9, 3, 4, 10, 6, 3, 4, 3, 6],
+    [8, 3, 2, 8, 2, 4, 4, 2, 6],
+    [0, 2, 4, 4, 2, 6],
+    [1, 0, 9, 2, 4, 3, 2, 6, 4, 4, 8, 3],
+    [1, 4, 9, 1, 2, 4, 2, 6, 4],
+    [8, 3, 1, 8, 1, 6, 8, 6, 4, 6, 1, 11],
+    [11, 0, 1, 11, 6, 0, 6, 4, 0],
+    [4, 3, 6, 4, 8, 3, 6, 3, 11, 0, 9, 3, 11, 3, 9],
+    [11, 4, 9, 6, 4, 11],
+    [4, 5, 9, 7, 10, 6],
+    [0, 3, 8, 4, 5, 9, 10, 6, 7],
+    [5, 1, 0, 5, 0, 4, 7, 10, 6],
+    [10, 6, 7, 8, 4, 3, 3, 4, 5, 3, 5, 1],
+    [9, 4, 5, 11, 2, 1, 7, 10, 6],
+    [6, 7, 10, 1, 11, 2, 0, 3, 8, 4, 5, 9],
+    [7, 10, 6, 5, 11, 4, 4, 11, 2, 4, 2, 0],
+    [3, 8, 4, 3, 4, 5, 3, 5, 2, 11, 2, 5, 10, 6, 7],
+    [7, 3, 2, 7, 2, 6, 5, 9, 4],
+    [9, 4, 5, 0, 6, 8, 0, 2, 6, 6, 7, 8],
+    [3, 2, 6, 3, 6, 7, 1, 0, 5, 5, 0, 4],
+    [6, 8, 2, 6, 7, 8, 2, 8, 1, 4, 5, 8, 1, 8, 5],
+    [9, 4, 5, 11, 6, 1, 1, 6, 7, 1, 7, 3],
+    [1, 11, 6, 1, 6, 7, 1, 7, 0, 8, 0, 7, 9, 4, 5],
+    [4, 11, 0, 4, 5, 11, 0, 11, 3, 6, 7, 11, 3, 11, 7],
+    [7, 11, 6, 7, 8, 11, 5, 11, 4, 4, 11, 8],
+    [6, 5, 9, 6, 9, 10, 10, 9, 8],
+    [3, 10, 6, 0, 3, 6, 0, 6, 5, 0, 5, 9],
+    [0, 8, 10, 0, 10, 5, 0, 5, 1, 5, 10, 6],
+    [6, 3, 10, 6, 5, 3, 5, 1, 3],
+    [1, 11, 2, 9, 10, 5, 9, 8, 10, 10, 6, 5],
+    [0, 3, 10, 0, 10, 6, 0, 6, 9, 5, 9, 6, 1, 11, 2],
+    [10, 5, 8, 10, 6, 5, 8, 5, 0, 11, 2, 5, 0, 5, 2],
+    [6, 3, 10, 6, 5, 3, 2, 3, 11, 11, 3, 5],
+    [5, 9, 8, 5, 8, 2, 5, 2, 6, 3, 2, 8],
+    [9, 6, 5, 9, 0, 6, 0, 2, 6],
+    [1, 8, 5, 1, 0, 8, 5, 8, 6, 3, 2, 8, 6, 8, 2],
+    [1, 6, 5, 2, 6, 1],
+    [1, 6, 3, 1, 11, 6, 3, 6, 8, 5, 9, 6, 8, 6, 9],
+    [11, 0, 1, 11, 6, 0, 9, 0, 5, 5, 0, 6],
+    [0, 8, 3, 5, 11, 6],
+    [11, 6, 5],
+    [10, 11, 5, 7, 10, 5],
+    [10, 11, 5, 10, 5, 7, 8, 0, 3],
+    [5, 7, 10, 5, 10, 11, 1, 0, 9],
+    [11, 5, 7, 11, 7, 10, 9, 1, 8, 8, 1, 3],
+    [10, 2, 1, 10, 1, 7, 7, 1, 5],
+    [0, 3, 8, 1, 7, 2, 1, 5, 7, 7, 10, 2],
+    [9, 5, 7, 9, 7, 2, 9, 2, 0, 2, 7, 10],
+    [7, 2, 5, 7, 10, 2, 5, 2, 9, 3, 8, 2, 9, 2, 8],
+    [2, 11, 5, 2, 5, 3, 3, 5, 7],
+    [8, 0, 2, 8, 2, 5, 8, 5, 7, 11, 5, 2],
+    [9, 1, 0, 5, 3, 11, 5, 7, 3, 3, 2, 11],
+    [9, 2, 8, 9, 1, 2, 8, 2, 7, 11, 5, 2, 7, 2, 5],
+    [1, 5, 3, 3, 5, 7],
+    [0, 7, 8, 0, 1, 7, 1, 5, 7],
+    [9, 3, 0, 9, 5, 3, 5, 7, 3],
+    [9, 7, 8, 5, 7, 9],
+    [5, 4, 8, 5, 8, 11, 11, 8, 10],
+    [5, 4, 0, 5, 0, 10, 5, 10, 11, 10, 0, 3],
+    [0, 9, 1, 8, 11, 4, 8, 10, 11, 11, 5, 4],
+    [11, 4, 10, 11, 5, 4, 10, 4, 3, 9, 1, 4, 3, 4, 1],
+    [2, 1, 5, 2, 5, 8, 2, 8, 10, 4, 8, 5],
+    [0, 10, 4, 0, 3, 10, 4, 10, 5, 2, 1, 10, 5, 10, 1],
+    [0, 5, 2, 0, 9, 5, 2, 5, 10, 4, 8, 5, 10, 5, 8],
+    [9, 5, 4, 2, 3, 10],
+    [2, 11, 5, 3, 2, 5, 3, 5, 4, 3, 4, 8],
+    [5, 2, 11, 5, 4, 2, 4, 0, 2],
+    [3, 2, 11, 3, 11, 5, 3, 5, 8, 4, 8, 5, 0, 9, 1],
+    [5, 2, 11, 5, 4, 2, 1, 2, 9, 9, 2, 4],
+    [8, 5, 4, 8, 3, 5, 3, 1, 5],
+    [0, 5, 4, 1, 5, 0],
+    [8, 5, 4, 8, 3, 5, 9, 5, 0, 0, 5, 3],
+    [9, 5, 4],
+    [4, 7, 10, 4, 10, 9, 9, 10, 11],
+    [0, 3, 8, 4, 7, 9, 9, 7, 10, 9, 10, 11],
+    [1, 10, 11, 1, 4, 10, 1, 0, 4, 7, 10, 4],
+    [3, 4, 1, 3, 8, 4, 1, 4, 11, 7, 10, 4, 11, 4, 10],
+    [4, 7, 10, 9, 4, 10, 9, 10, 2, 9, 2, 1],
+    [9, 4, 7, 9, 7, 10, 9, 10, 1, 2, 1, 10, 0, 3, 8],
+    [10, 4, 7, 10, 2, 4, 2, 0, 4],
+    [10, 4, 7, 10, 2, 4, 8, 4, 3, 3, 4, 2],
+    [2, 11, 9, 2, 9, 7, 2, 7, 3, 7, 9, 4],
+    [9, 7, 11, 9, 4, 7, 11, 7, 2, 8, 0, 7, 2, 7, 0],
+    [3, 11, 7, 3, 2, 11, 7, 11, 4, 1, 0, 11, 4, 11, 0],
+    [1, 2, 11, 8, 4, 7],
+    [4, 1, 9, 4, 7, 1, 7, 3, 1],
+    [4, 1, 9, 4, 7, 1, 0, 1, 8, 8, 1, 7],
+    [4, 3, 0, 7, 3, 4],
+    [4, 7, 8],
+    [9, 8, 11, 11, 8, 10],
+    [3, 9, 0, 3, 10, 9, 10, 11, 9],
+    [0, 11, 1, 0, 8, 11, 8, 10, 11],
+    [3, 11, 1, 10, 11, 3],
+    [1, 10, 2, 1, 9, 10, 9, 8, 10],
+    [3, 9, 0, 3, 10, 9, 1, 9, 2, 2, 9, 10],
+    [0, 10, 2, 8, 10, 0],
+    [3, 10, 2],
+    [2, 8, 3, 2, 11, 8, 11, 9, 8],
+    [9, 2, 11, 0, 2, 9],
+    [2, 8, 3, 2, 11, 8, 0, 8, 1, 1, 8, 11],
+    [1, 2, 11],
+    [1, 8, 3, 9, 8, 1],
+    [0, 1, 9],
+    [0, 8, 3],
+    [],
+]
+
+# Same table padded with -1 to a fixed width so it can be indexed with a case array
+TRI_TABLE_PADDED = np.full((256, 15), -1, dtype=np.int8)
+for case, row in enumerate(TRI_TABLE):
+    TRI_TABLE_PADDED[case, :len(row)] = row
+
+
+def volume_grid(values, dims):
+    # (x, y, z)-indexed view of VTK point data, which stores x fastest
+    nx, ny, nz = dims
+    return np.asarray(values).reshape(nz, ny, nx).transpose(2, 1, 0)
+
+
+# Vectorized marching cubes over an (x, y, z)-indexed volume: all cells are classified
+# at once and the triangles of every active cell are looked up together. Vertices sit on
+# grid edges and are shared by the cells around them.
+# Returns float32 vertices (N, 3) and int32 faces (M, 3).
+def marching_cubes(volume, isovalue, origin=(0.0, 0.0, 0.0), spacing=(1.0, 1.0, 1.0)):
+    volume = np.asarray(volume, dtype=np.float32)
+    vertices, _, faces = march_blocks(volume[None], isovalue)
+    vertices *= np.asarray(spacing, dtype=np.float32)
+    vertices += np.asarray(origin, dtype=np.float32)
+    return vertices, faces
+
+
+# The same over a stack of equally sized (B, nx, ny, nz) blocks in one pass, e.g. the
+# bricks of a volume that straddle the isovalue. Returns block-local grid-index
+# vertices, the (block, axis, i, j, k) grid edge each vertex lies on, and faces.
+def march_blocks(blocks, isovalue):
+    blocks = np.asarray(blocks, dtype=np.float32)
+    _, nx, ny, nz = blocks.shape
+    empty = (np.zeros((0, 3), dtype=np.float32), np.zeros((0, 5), dtype=np.int64),
+             np.zeros((0, 3), dtype=np.int32))
+    if min(nx, ny, nz) < 2:
+        return empty
+    inside = blocks >= isovalue
+
+    # Case index of every cell from its 8 corners
+    cases = np.zeros((len(blocks), nx - 1, ny - 1, nz - 1), dtype=np.uint8)
+    for bit, (dx, dy, dz) in enumerate(CORNER_OFFSETS):
+        corner = inside[:, dx:nx - 1 + dx, dy:ny - 1 + dy, dz:nz - 1 + dz]
+        cases |= corner.view(np.uint8) << np.uint8(bit)
+    cb, ci, cj, ck = np.nonzero((cases != 0) & (cases != 255))
+    if len(ci) == 0:
+        return empty
+
+    # One vertex per grid edge that crosses the isovalue, numbered axis by axis
+    vertices = []
+    vertex_edges = []
+    edge_ids = []
+    count = 0
+    for axis in range(3):
+        lower = [slice(None)] * 4
+        upper = [slice(None)] * 4
+        lower[axis + 1] = slice(0, -1)
+        upper[axis + 1] = slice(1, None)
+        lower, upper = tuple(lower), tuple(upper)
+
+        crossing = np.nonzero(inside[lower] != inside[upper])
+        ids = np.full(inside[lower].shape, -1, dtype=np.int32)
+        ids[crossing] = np.arange(count, count + len(crossing[0]), dtype=np.int32)
+        count += len(crossing[0])
+
+        v0 = blocks[lower][crossing]
+        v1 = blocks[upper][crossing]
+        points = np.stack(crossing[1:], axis=1).astype(np.float32)
+        points[:, axis] += (isovalue - v0) / (v1 - v0)
+        vertices.append(points)
+        vertex_edges.append(np.stack([crossing[0], np.full_like(crossing[0], axis), *crossing[1:]], axis=1))
+        edge_ids.append(ids)
+
+    # Look up the triangle edges of every active cell and map them to vertex ids
+    rows = TRI_TABLE_PADDED[cases[cb, ci, cj, ck]]
+    cell, slot = np.nonzero(rows >= 0)
+    edges = rows[cell, slot]
+    axes = EDGE_AXIS[edges]
+    gb = cb[cell]
+    gx = ci[cell] + EDGE_START[edges, 0]
+    gy = cj[cell] + EDGE_START[edges, 1]
+    gz = ck[cell] + EDGE_START[edges, 2]
+    vertex_ids = np.empty(len(edges), dtype=np.int32)
+    for axis in range(3):
+        on_axis = axes == axis
+        vertex_ids[on_axis] = edge_ids[axis][gb[on_axis], gx[on_axis], gy[on_axis], gz[on_axis]]
+
+    return np.concatenate(vertices), np.concatenate(vertex_edges), vertex_ids.reshape(-1, 3)
+
+
+def mesh3d_arrays(vertices, faces):
+    # Keyword arguments for go.Mesh3d
+    return dict(x=vertices[:, 0], y=vertices[:, 1], z=vertices[:, 2],
+                i=faces[:, 0], j=faces[:, 1], k=faces[:, 2])
@@ -0,0 +1,139 @@
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+import numpy as np
+
+
+def entry_nbytes(entry):
+    # Memory held by a cached mesh: arrays, base64 strings and containers of them
+    if isinstance(entry, np.ndarray):
+        return entry.nbytes
+    if isinstance(entry, (str, bytes)):
+        return len(entry)
+    if isinstance(entry, dict):
+        return sum(entry_nbytes(v) for v in entry.values())
+    if isinstance(entry, (list, tuple)):
+        return sum(entry_nbytes(v) for v in entry)
+    return 0
+
+
+class MeshCache:
+    # LRU cache of isosurface meshes for the quantized slider isovalues.
+    # A background thread pool fills it nearest-to-the-current-value first; prefetched
+    # meshes enter at the cold end so they are evicted before anything the user visited.
+    def __init__(self, extract, data_min, data_max, steps=200, max_bytes=256e6, workers=4,
+                 listener=None):
+        self.extract = extract
+        self.listener = listener
+        self.data_min = float(data_min)
+        self.step = (float(data_max) - self.data_min) / steps
+        self.steps = steps
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.joined = 0
+        self.nbytes = 0
+        self._entries = OrderedDict()
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=workers)
+
+    def key(self, iso):
+        return int(np.clip(round((iso - self.data_min) / self.step), 0, self.steps))
+
+    def isovalue(self, key):
+        return self.data_min + key * self.step
+
+    def get(self, iso):
+        # Single-flight: concurrent misses on one isovalue (several viewers, or a viewer
+        # and the prefetch) share one extraction
+        key = self.key(iso)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+            future = self._pending.get(key)
+            if future is not None and future.cancel():
+                # Only queued for prefetch: build it here instead
+                future = None
+            owner = future is None
+            if owner:
+                future = self._pending[key] = Future()
+                future.set_running_or_notify_cancel()   # prefetch() can no longer cancel it
+            else:
+                self.joined += 1
+        if not owner:
+            # Already being built by another thread: wait for it instead of duplicating work
+            entry = future.result()
+            if entry is not None:
+                return entry
+            with self._lock:
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                    return self._entries[key]
+            return self.extract(self.isovalue(key))
+        try:
+            entry = self.extract(self.isovalue(key))
+            self._store(key, entry, hot=True)
+            future.set_result(entry)
+            return entry
+        except BaseException as error:
+            future.set_exception(error)
+            raise
+        finally:
+            with self._lock:
+                if self._pending.get(key) is future:
+                    del self._pending[key]
+
+    def prefetch(self, iso):
+        # (Re)queue every missing isovalue, nearest to iso first
+        center = self.key(iso)
+        with self._lock:
+            for key, future in list(self._pending.items()):
+                if future.cancel():
+                    del self._pending[key]
+            for key in sorted(range(self.steps + 1), key=lambda k: abs(k - center)):
+                if key not in self._entries and key not in self._pending:
+                    self._pending[key] = self._executor.submit(self._fill, key)
+
+    def _fill(self, key):
+        try:
+            with self._lock:
+                full = self.nbytes >= self.max_bytes
+            if not full:
+                self._store(key, self.extract(self.isovalue(key)), hot=False)
+        finally:
+            with self._lock:
+                self._pending.pop(key, None)
+
+    def _store(self, key, entry, hot):
+        size = entry_nbytes(entry)
+        with self._lock:
+            if key in self._entries:
+                return
+            self._entries[key] = entry
+            self._entries.move_to_end(key, last=hot)
+            self.nbytes += size
+            while self.nbytes > self.max_bytes and len(self._entries) > 1:
+                _, evicted = self._entries.popitem(last=False)
+                self.nbytes -= entry_nbytes(evicted)
+        if self.listener is not None:
+            self.listener(self)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return dict(entries=len(self._entries), slots=self.steps + 1,
+                        pending=len(self._pending), hits=self.hits, misses=self.misses, joined=self.joined,
+                        hit_rate=self.hits / lookups if lookups else 0.0, nbytes=self.nbytes)
+
+    def summary(self):
+        s = self.stats()
+        return (f"mesh cache: {s['entries']}/{s['slots']} isovalues, {s['nbytes'] / 1e6:.1f} MB, "
+                f"hit rate {s['hit_rate']:.0%} ({s['hits']} hits / {s['misses']} misses), "
+                f"{s['joined']} shared builds, {s['pending']} queued")
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,64 @@
+import numpy as np
+
+# Volume axis each view cuts across; the plane keeps the other two axes in (x, y, z) order
+SLICE_AXES = {'axial': 2, 'coronal': 1, 'sagittal': 0}
+
+# Marching squares. Cell corners c0 (i, j), c1 (i+1, j), c2 (i+1, j+1), c3 (i, j+1);
+# bit i of the case is set when corner i is >= the isovalue. Edges e0 c0-c1,
+# e1 c1-c2, e2 c3-c2, e3 c0-c3.
+SQUARE_CORNERS = np.array([(0, 0), (1, 0), (1, 1), (0, 1)])
+SQUARE_EDGES = np.array([(0, 1), (1, 2), (3, 2), (0, 3)])
+# Up to two segments (edge pairs) per case. The saddles 5 and 10 are listed with
+# their centre below the isovalue; rows 16 and 17 are the same cases with it above.
+SEGMENT_TABLE = np.array([
+    [(-1, -1), (-1, -1)], [(3, 0), (-1, -1)], [(0, 1), (-1, -1)], [(3, 1), (-1, -1)],
+    [(1, 2), (-1, -1)], [(3, 0), (1, 2)], [(0, 2), (-1, -1)], [(3, 2), (-1, -1)],
+    [(2, 3), (-1, -1)], [(0, 2), (-1, -1)], [(0, 1), (2, 3)], [(1, 2), (-1, -1)],
+    [(1, 3), (-1, -1)], [(0, 1), (-1, -1)], [(3, 0), (-1, -1)], [(-1, -1), (-1, -1)],
+    [(0, 1), (2, 3)], [(3, 0), (1, 2)],
+], dtype=np.int8)
+
+
+def marching_squares(plane, isovalue):
+    # Isoline segments of a 2-D (u, v)-indexed array, as (N, 2, 2) float32 grid-index
+    # endpoints. Works on strided views, so a volume slice is never copied.
+    nu, nv = plane.shape
+    if min(nu, nv) < 2:
+        return np.zeros((0, 2, 2), dtype=np.float32)
+    corners = [plane[du:nu - 1 + du, dv:nv - 1 + dv] for du, dv in SQUARE_CORNERS]
+    cases = np.zeros((nu - 1, nv - 1), dtype=np.uint8)
+    for bit, corner in enumerate(corners):
+        cases |= (corner >= isovalue).view(np.uint8) << np.uint8(bit)
+    ci, cj = np.nonzero((cases != 0) & (cases != 15))
+    if len(ci) == 0:
+        return np.zeros((0, 2, 2), dtype=np.float32)
+
+    # Saddles: pick the diagonal by the value at the cell centre
+    case = cases[ci, cj].astype(np.int64)
+    saddle = np.nonzero((case == 5) | (case == 10))[0]
+    centre = sum(corner[ci[saddle], cj[saddle]] for corner in corners) / 4
+    above = saddle[centre >= isovalue]
+    case[above] = np.where(case[above] == 5, 16, 17)
+
+    rows = SEGMENT_TABLE[case]
+    cell, slot = np.nonzero(rows[:, :, 0] >= 0)
+    edges = rows[cell, slot]                                   # (S, 2) edge ids
+    a = SQUARE_CORNERS[SQUARE_EDGES[edges, 0]]                 # (S, 2, 2) corner offsets
+    b = SQUARE_CORNERS[SQUARE_EDGES[edges, 1]]
+    base = np.stack([ci[cell], cj[cell]], axis=1)[:, None, :]
+    va = plane[base[..., 0] + a[..., 0], base[..., 1] + a[..., 1]]
+    vb = plane[base[..., 0] + b[..., 0], base[..., 1] + b[..., 1]]
+    t = ((isovalue - va) / (vb - va))[..., None]
+    return (base + a + t * (b - a)).astype(np.float32)
+
+
+def contour_lines(plane, isovalue, u_coords, v_coords):
+    # Segments as one polyline with NaN breaks, in world coordinates, for a Scatter trace
+    segments = marching_squares(plane, isovalue)
+    u0, v0 = u_coords[0], v_coords[0]
+    du = u_coords[1] - u0 if len(u_coords) > 1 else 1.0
+    dv = v_coords[1] - v0 if len(v_coords) > 1 else 1.0
+    lines = np.full((len(segments), 3, 2), np.nan, dtype=np.float32)
+    lines[:, :2, 0] = u0 + segments[..., 0] * du
+    lines[:, :2, 1] = v0 + segments[..., 1] * dv
+    return lines[..., 0].ravel(), lines[..., 1].ravel()
@@ -0,0 +1,69 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class UpdateScheduler:
+    # Debounces widget events and computes updates in a worker thread. Every request
+    # gets a generation number; work for a generation the user has already moved past
+    # is cancelled if still queued, and its result is dropped if it finishes late, so
+    # only the newest result is ever applied.
+    def __init__(self, compute, apply, debounce=0.05):
+        self.compute = compute
+        self.apply = apply
+        self.debounce = debounce
+        self.counts = dict(requested=0, debounced=0, cancelled=0, dropped=0, applied=0)
+        self._generation = 0
+        self._timer = None
+        self._waiting = False
+        self._future = None
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1)
+
+    def request(self, value):
+        with self._lock:
+            self._generation += 1
+            self.counts['requested'] += 1
+            if self._waiting:
+                # The previous event never reached the worker
+                self._timer.cancel()
+                self.counts['debounced'] += 1
+            self._waiting = True
+            self._timer = threading.Timer(self.debounce, self._submit, (self._generation, value))
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _submit(self, generation, value):
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._waiting = False
+            if self._future is not None and self._future.cancel():
+                self.counts['cancelled'] += 1
+            self._future = self._executor.submit(self._run, generation, value)
+
+    def _is_stale(self, generation):
+        with self._lock:
+            stale = generation != self._generation
+            if stale:
+                self.counts['dropped'] += 1
+            return stale
+
+    def _run(self, generation, value):
+        if self._is_stale(generation):
+            return
+        result = self.compute(value)
+        if self._is_stale(generation):
+            return
+        self.apply(value, result)
+        with self._lock:
+            self.counts['applied'] += 1
+
+    def summary(self):
+        c = dict(self.counts)
+        return (f"updates: {c['requested']} events, {c['debounced']} debounced, "
+                f"{c['cancelled']} cancelled, {c['dropped']} stale dropped, {c['applied']} applied")
+
+    def shutdown(self):
+        if self._timer is not None:
+            self._timer.cancel()
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,114 @@
+import base64
+import os
+import numpy as np
+from vedo import load   # light wrapper around vtkXMLImageDataReader
+from marching_cubes import volume_grid
+from contour_spectrum import ContourSpectrum
+
+
+class Volume:
+    # Regular-grid scalar volume: float32 samples plus origin, spacing and dims.
+    # Point coordinates are never stored, they are generated when asked for.
+    def __init__(self, values, dims, origin=(0.0, 0.0, 0.0), spacing=(1.0, 1.0, 1.0)):
+        self.values = np.ascontiguousarray(values, dtype=np.float32).reshape(-1)
+        self.dims = tuple(int(d) for d in dims)
+        self.origin = tuple(float(o) for o in origin)
+        self.spacing = tuple(float(s) for s in spacing)
+        self.source = None
+        self._spectrum = None
+        if self.values.size != np.prod(self.dims):
+            raise ValueError(f"{self.values.size} samples do not fit a {self.dims} grid")
+
+    @classmethod
+    def from_vti(cls, path):
+        vti = load(path)
+        volume = cls(vti.pointdata[0], vti.dimensions(), vti.origin(), vti.spacing())
+        volume.source = path
+        return volume
+
+    @property
+    def grid(self):
+        # (x, y, z)-indexed view, no copy
+        return volume_grid(self.values, self.dims)
+
+    @property
+    def nbytes(self):
+        return self.values.nbytes
+
+    @property
+    def range(self):
+        return float(self.values.min()), float(self.values.max())
+
+    def axis_coords(self, axis):
+        return (self.origin[axis] + self.spacing[axis] * np.arange(self.dims[axis])).astype(np.float32)
+
+    def slice(self, axis, index):
+        # Plane `index` across `axis` of the (x, y, z) grid, as a view, no copy
+        where = [slice(None)] * 3
+        where[axis] = int(np.clip(index, 0, self.dims[axis] - 1))
+        return self.grid[tuple(where)]
+
+    def point_coords(self, start=0, stop=None):
+        # World coordinates of flat point ids [start, stop) in VTK (x fastest) order
+        nx, ny, _ = self.dims
+        ids = np.arange(start, self.values.size if stop is None else stop)
+        ijk = np.stack([ids % nx, (ids // nx) % ny, ids // (nx * ny)], axis=1)
+        return (np.asarray(self.origin) + ijk * np.asarray(self.spacing)).astype(np.float32)
+
+    def contour_spectrum(self, steps=200):
+        # Area / triangle / component curves at the slider's steps + 1 isovalues, kept
+        # in memory and next to the source file until the file changes
+        if self._spectrum is not None and len(self._spectrum['isovalue']) == steps + 1:
+            return self._spectrum
+        cache_file = stamp = None
+        if self.source is not None:
+            cache_file = f"{self.source}.spectrum.npz"
+            stamp = np.array([os.path.getmtime(self.source), os.path.getsize(self.source), steps])
+            if os.path.exists(cache_file):
+                with np.load(cache_file) as cached:
+                    if np.array_equal(cached['stamp'], stamp):
+                        self._spectrum = {k: cached[k] for k in cached.files if k != 'stamp'}
+                        return self._spectrum
+
+        lo, hi = self.range
+        isovalues = lo + np.arange(steps + 1) * ((hi - lo) / steps)
+        self._spectrum = ContourSpectrum(self.grid, self.spacing).sample(isovalues)
+        if cache_file is not None:
+            np.savez(cache_file, stamp=stamp, **self._spectrum)
+        return self._spectrum
+
+
+def typed_array(array):
+    # Plotly's base64 typed-array encoding: raw little-endian bytes instead of a JSON list
+    array = np.ascontiguousarray(array)
+    if array.dtype == np.float64:
+        array = array.astype(np.float32)
+    elif array.dtype == np.int64:
+        array = array.astype(np.int32)
+    array = array.astype(array.dtype.newbyteorder('<'), copy=False)
+    return dict(dtype=array.dtype.str[1:], bdata=base64.b64encode(array.tobytes()).decode('ascii'))
+
+
+def mesh3d_payload(vertices, faces):
+    # go.Mesh3d keyword arguments with every array as a typed array
+    return dict(x=typed_array(vertices[:, 0]), y=typed_array(vertices[:, 1]), z=typed_array(vertices[:, 2]),
+                i=typed_array(faces[:, 0]), j=typed_array(faces[:, 1]), k=typed_array(faces[:, 2]))
+
+
+class SortedValues:
+    # The volume's samples sorted once, so value-band queries are binary searches
+    def __init__(self, values):
+        self.sorted = np.sort(np.asarray(values).reshape(-1))
+
+    def band(self, lo, hi):
+        # All samples in [lo, hi] as a view, no mask over the volume
+        start = np.searchsorted(self.sorted, lo, side='left')
+        stop = np.searchsorted(self.sorted, hi, side='right')
+        return self.sorted[start:stop]
+
+    def histogram(self, lo, hi, bins):
+        # Counts of `bins` equal bins over [lo, hi]: one searchsorted per bin edge
+        edges = np.linspace(lo, hi, bins + 1)
+        idx = np.searchsorted(self.sorted, edges, side='left')
+        idx[-1] = np.searchsorted(self.sorted, edges[-1], side='right')
+        return 0.5 * (edges[:-1] + edges[1:]), np.diff(idx), edges[1] - edges[0]
@@ -11,7 +11,9 @@ import plotly.express as px
 import plotly.graph_objects as go
 import numpy as np
 import pandas as pd
+from columnar_cache import read_cached
 import dash_bootstrap_components as dbc
+from district_store import DistrictStore
 
 # Load India geojson for map visualizations (state boundaries)
 with open("project661\india.json", encoding="utf-8") as f:
@@ -71,17 +73,56 @@ population_data = {
     'chandigarh': 1055450
     # Add more as needed
 }
-state_df_pct = pd.read_excel(
+state_df_pct = read_cached(
     r"C:\Users\aadya\OneDrive\Desktop\project661\project661\statewise_aggregated_data_percentages.xlsx"
 )
 
+# District table, parsed once and shared read-only by every district callback
+district_store = DistrictStore('districtwise_data_percentages.csv')
+
+def normalize_state(name):
+    """Key used to match state names across the GeoJSON and the tables"""
+    return str(name).strip().lower()
+
+# Row of each state in state_df_pct, by normalized name (first row wins, as before)
+state_row_index = {}
+for row, name in enumerate(state_df_pct["State name"]):
+    state_row_index.setdefault(normalize_state(name), row)
+
+# Map-ready copy of state_df_pct: one row per GeoJSON feature (in feature order),
+# one column per attribute, NaN where a state has no data. Colouring the map is then
+# a single column lookup instead of a table scan per feature.
+feature_states = []
+for feature in india_geo["features"]:
+    props = feature.get("properties", {})
+    state_name = props.get("st_nm") or props.get("name")
+    if state_name:
+        feature_states.append(state_name)
+feature_rows = np.array([state_row_index.get(normalize_state(name), -1) for name in feature_states])
+feature_cols = {col: j for j, col in enumerate(c for c in state_df_pct.columns if c != "State name")}
+# Row -1 of the padded table is all NaN, so states missing from the data map onto it
+_padded = np.full((len(state_df_pct) + 1, len(feature_cols)), np.nan)
+for col, j in feature_cols.items():
+    _padded[:-1, j] = pd.to_numeric(state_df_pct[col], errors="coerce")
+feature_matrix = _padded[feature_rows]
+feature_population = np.array([
+    population_data.get(name.lower().replace(" ", "_").replace("-", "_"), 0) for name in feature_states
+])
+
 def state_value(state_name: str, col: str):
     """Return the value for a state & column; None if missing."""
-    row = state_df_pct[state_df_pct["State name"].str.lower()
-                       == state_name.lower()]
-    if row.empty or col not in row.columns:
+    row = state_row_index.get(normalize_state(state_name))
+    if row is None or col not in state_df_pct.columns:
         return None
-    return row.iloc[0][col]
+    return state_df_pct[col].iloc[row]
+
+def feature_values(col):
+    """Values of `col` for every GeoJSON feature (feature order), missing as 0"""
+    if col not in feature_cols:
+        return np.zeros(len(feature_states))
+    values = feature_matrix[:, feature_cols[col]]
+    # Only NaN becomes 0; inf (a zero denominator) is passed through as before
+    return np.where(np.isnan(values), 0.0, values)
 # =========================
 # Attribute and Label Maps
 # =========================
@@ -360,20 +401,9 @@ def draw_india_map(selected_state, selected_subcat, selected_category):
             pct = f"{first}_pct"
             colour_col = pct if pct in state_df_pct.columns else first
 
-    # 2. Build lists for choropleth
-    locations, values = [], []
-    for feat in india_geo["features"]:
-        props = feat.get("properties", {})
-        state_name = props.get("st_nm") or props.get("name")
-        if not state_name:
-            continue
-        locations.append(state_name)
-        if colour_col:
-            v = state_value(state_name, colour_col)
-            values.append(v if pd.notna(v) else 0)
-        else:
-            key = state_name.lower().replace(" ", "_").replace("-", "_")
-            values.append(population_data.get(key, 0))
+    # 2. Locations and colours, already aligned with the GeoJSON features
+    locations = feature_states
+    values = feature_values(colour_col) if colour_col else feature_population
 
     legend_title = "Population" if not colour_col else short_label(colour_col)
 
@@ -447,21 +477,15 @@ def update_kpis(selected_state, selected_subcat, clickData):
     # 2. Extract district name from map click
     district = clickData['points'][0]['location']  # adjust depending on your map's hovertemplate
 
-    # 3. Load the per-district data (ensure you've already read it or reuse your df)
-    df = pd.read_csv('districtwise_data_percentages.csv')
-    df_state = df[df['State name'].str.lower() == district.lower()]
-    # But you probably want: df_dist = df[(df['State name']==state_name)&(df['District name']==district)]
+    # 3. Pick the correct column (pct if available)
+    col = district_store.resolve(selected_subcat)
 
-    df_dist = df[
-        (df['State name'].str.lower() == selected_state.replace("_"," ").lower()) &
-        (df['District name'] == district)
-    ]
-
-    # 4. Pick the correct column (pct if available)
-    col = selected_subcat + '_pct' if (selected_subcat + '_pct') in df_dist.columns else selected_subcat
+    # 4. Look the district up in the shared store
+    v_dist = district_store.value(selected_state.replace("_"," "), district, col)
+    if v_dist is None:
+        return "-", "-", "-"
 
     # 5. Compute values
-    v_dist = df_dist[col].iloc[0]
     # state average from your state_df_pct
     v_state = state_df_pct.loc[
         state_df_pct["State name"].str.lower() == selected_state.replace("_"," ").lower(),
@@ -493,7 +517,6 @@ def update_district_bar(selected_state, selected_category):
     """
     if not selected_state or not selected_category:
         return go.Figure()
-    df = pd.read_csv('districtwise_data_percentages.csv')
     # Find the state name from the selected key
     state_name = None
     for k, v in reverse_state_lookup.items():
@@ -502,7 +525,7 @@ def update_district_bar(selected_state, selected_category):
             break
     if not state_name:
         return go.Figure()
-    df_state = df[df['State name'].str.lower() == state_name.lower()]
+    df_state = district_store.state_frame(state_name)
     subcats = ATTRIBUTE_MAP.get(selected_category, [])
     subcats_pct = [c + '_pct' if c + '_pct' in df_state.columns else c for c in subcats]
     bar_data = {cat: df_state[cat].sum() for cat in subcats_pct if cat in df_state.columns}
@@ -585,7 +608,6 @@ def update_box_whisker_new(selected_state, selected_subcat):
     if not selected_state or not selected_subcat:
         raise PreventUpdate
     try:
-        df = pd.read_csv('districtwise_data_percentages.csv')
         # Get state name for lookup
         state_name = None
         for k, v in reverse_state_lookup.items():
@@ -594,7 +616,7 @@ def update_box_whisker_new(selected_state, selected_subcat):
                 break
         if not state_name:
             return go.Figure()
-        df_state = df[df['State name'].str.lower() == state_name.lower()]
+        df_state = district_store.state_frame(state_name)
         col = selected_subcat + '_pct' if (selected_subcat + '_pct') in df_state.columns else selected_subcat
         if col not in df_state.columns:
             return go.Figure()
@@ -647,7 +669,6 @@ def update_pie_charts(selected_state, selected_subcat):
     if not selected_state or not selected_subcat:
         return go.Figure(), go.Figure()
     try:
-        df = pd.read_csv('districtwise_data_percentages.csv')
         state_name = None
         for k, v in reverse_state_lookup.items():
             if v == selected_state:
@@ -655,7 +676,7 @@ def update_pie_charts(selected_state, selected_subcat):
                 break
         if not state_name:
             return go.Figure(), go.Figure()
-        df_state = df[df['State name'].str.lower() == state_name.lower()]
+        df_state = district_store.state_frame(state_name)
         col = selected_subcat + '_pct' if (selected_subcat + '_pct') in df_state.columns else selected_subcat
         if col not in df_state.columns:
             return go.Figure(), go.Figure()
@@ -749,7 +770,6 @@ def update_state_district_map(selected_state, selected_subcat):
         with open(filename, encoding="utf-8") as f:
             state_geo = json.load(f)
         # Load data
-        df = pd.read_csv('districtwise_data_percentages.csv')
         # Get state name for lookup
         state_name = None
         for k, v in reverse_state_lookup.items():
@@ -758,7 +778,7 @@ def update_state_district_map(selected_state, selected_subcat):
                 break
         if not state_name:
             return go.Figure()
-        df_state = df[df['State name'].str.lower() == state_name.lower()]
+        df_state = district_store.state_frame(state_name)
         col = selected_subcat + '_pct' if (selected_subcat + '_pct') in df_state.columns else selected_subcat
         if col not in df_state.columns:
             return go.Figure()
@@ -884,7 +904,6 @@ def update_correlation_scatter(selected_state, selected_subcat, correlation_attr
             html.Div(desc, style={'flex': '1'})
         ], style={'display': 'flex', 'flexDirection': 'row', 'alignItems': 'center'})
     try:
-        df = pd.read_csv('districtwise_data_percentages.csv')
         # Get state name for lookup
         state_name = None
         for k, v in reverse_state_lookup.items():
@@ -911,7 +930,7 @@ def update_correlation_scatter(selected_state, selected_subcat, correlation_attr
                 indicator,
                 html.Div(desc, style={'flex': '1'})
             ], style={'display': 'flex', 'flexDirection': 'row', 'alignItems': 'center'})
-        df_state = df[df['State name'].str.lower() == state_name.lower()]
+        df_state = district_store.state_frame(state_name)
         # X: selected_subcat, Y: first subcat of correlation_attr_cat
         x_col = selected_subcat + '_pct' if (selected_subcat + '_pct') in df_state.columns else selected_subcat
         corr_subcats = ATTRIBUTE_MAP.get(correlation_attr_cat, [])
@@ -1,4 +1,5 @@
 import pandas as pd
+from columnar_cache import read_cached
 from dash import Dash, dcc, html, Output, Input
 import plotly.graph_objs as go
 
@@ -54,7 +55,7 @@ ATTRIBUTE_MAP = {
 }
 
 # ---- Load Data ----
-df = pd.read_excel("india-districts-census-2011.xlsx", sheet_name="india-districts-census-2011")
+df = read_cached("india-districts-census-2011.xlsx", sheet_name="india-districts-census-2011")
 
 states = sorted(df["State name"].unique())
 default_main = "Population"
@@ -0,0 +1,117 @@
+# =========================
+# Shared District Data Store
+# =========================
+
+# The district CSV is loaded once at startup (through the columnar cache) and every
+# callback reads from this store instead of calling pd.read_csv per request. The
+# store is read-only: the frames and arrays it hands out are shared between
+# callbacks and must not be modified in place (filter / sort / dropna return new
+# frames, which is fine).
+
+import sys
+import threading
+import time
+import numpy as np
+import pandas as pd
+from columnar_cache import read_cached
+
+
+class DistrictStore:
+    """Read-only, in-memory district table with per-state lookups"""
+
+    def __init__(self, path):
+        start = time.perf_counter()
+        self.path = path
+        try:
+            self.frame = read_cached(path)
+        except Exception as e:
+            # Same as before the store existed: callbacks fall back to empty figures
+            print(f"❌ Error loading {path}: {e}")
+            self.frame = pd.DataFrame(columns=['State name', 'District name'])
+        self.load_ms = (time.perf_counter() - start) * 1000
+        self.columns = frozenset(self.frame.columns)
+
+        # One frame per state, keyed by the lower-cased state name
+        state_key = self.frame['State name'].str.lower()
+        self._states = {name: rows.reset_index(drop=True)
+                        for name, rows in self.frame.groupby(state_key, sort=False)}
+        self._arrays = {}
+        self._lock = threading.Lock()
+
+    def has(self, col):
+        return col in self.columns
+
+    def resolve(self, subcat):
+        """Column to use for a subcategory: its _pct column when present"""
+        pct = subcat + '_pct'
+        return pct if pct in self.columns else subcat
+
+    def state_frame(self, state_name):
+        """All districts of one state (case-insensitive); empty frame if unknown"""
+        rows = self._states.get(str(state_name).lower())
+        return rows if rows is not None else self.frame.iloc[0:0]
+
+    def district_values(self, state_name, col):
+        """['District name', col] for one state, without missing values"""
+        rows = self.state_frame(state_name)
+        if col not in self.columns:
+            return rows[['District name']].iloc[0:0]
+        return rows[['District name', col]].dropna()
+
+    def value(self, state_name, district, col):
+        """Value of one district, or None"""
+        rows = self.state_frame(state_name)
+        match = rows.loc[rows['District name'] == district, col] if col in self.columns else []
+        return match.iloc[0] if len(match) else None
+
+    def numeric(self, col):
+        """Whole column as a read-only float64 array (cached)"""
+        with self._lock:
+            if col not in self._arrays:
+                array = pd.to_numeric(self.frame[col], errors='coerce').to_numpy(dtype=np.float64, copy=True)
+                array.flags.writeable = False
+                self._arrays[col] = array
+            return self._arrays[col]
+
+    def text(self, col):
+        """Whole column as a read-only array of str"""
+        with self._lock:
+            key = ('text', col)
+            if key not in self._arrays:
+                array = self.frame[col].astype(str).to_numpy(dtype=object, copy=True)
+                array.flags.writeable = False
+                self._arrays[key] = array
+            return self._arrays[key]
+
+    def states(self):
+        return list(self._states)
+
+
+def compare_latency(path, repeats=20):
+    """Time one dropdown change (six callbacks) with pd.read_csv per callback vs the store"""
+    store = DistrictStore(path)
+    state_name = store.states()[len(store.states()) // 2]
+    col = store.resolve('Literate')
+
+    def per_request():
+        for _ in range(6):
+            df = pd.read_csv(path)
+            df_state = df[df['State name'].str.lower() == state_name]
+            df_state[['District name', col]].dropna()
+
+    def shared():
+        for _ in range(6):
+            store.district_values(state_name, col)
+
+    for label, fn in (("pd.read_csv per callback", per_request), ("shared DistrictStore", shared)):
+        times = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            fn()
+            times.append((time.perf_counter() - start) * 1000)
+        print(f"{label:>26}: {np.median(times):8.2f} ms median, {np.max(times):8.2f} ms max per dropdown change")
+    print(f"{'one-off store load':>26}: {store.load_ms:8.2f} ms at startup")
+
+
+if __name__ == "__main__":
+    compare_latency(sys.argv[1] if len(sys.argv) > 1 else 'districtwise_data_percentages.csv')
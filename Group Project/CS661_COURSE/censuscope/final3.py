@@ -1,6 +1,7 @@
 import json
 import os
 import pandas as pd
+from columnar_cache import read_cached
 from dash import Dash, dcc, html, Output, Input, State
 import plotly.express as px
 import plotly.graph_objs as go
@@ -11,11 +12,11 @@ import numpy as np
 # ------------------------
 # 1. Load & prepare data
 # ------------------------
-district_df = pd.read_excel(
+district_df = read_cached(
     r"C:\Users\Vibha Narayan\OneDrive\Desktop\coding\GitDemo\CS661\Group Project\CS661_COURSE\censuscope\india-districts-census-2011.xlsx",
     sheet_name="india-districts-census-2011"
 )
-state_df = pd.read_excel(
+state_df = read_cached(
     r"C:\Users\Vibha Narayan\OneDrive\Desktop\coding\GitDemo\CS661\Group Project\CS661_COURSE\censuscope\statewise_aggregated_data.xlsx"
 )
 district_df["district_norm"] = district_df["District name"].str.strip().str.upper()
@@ -1,15 +1,16 @@
 import pandas as pd
+from columnar_cache import read_cached
 from dash import Dash, dcc, html, Output, Input
 import plotly.graph_objs as go
 import dash_bootstrap_components as dbc
 
 # --- Load data ---
-district_df = pd.read_excel(
+district_df = read_cached(
     r"C:\Users\aadya\OneDrive\Desktop\CS661_COURSE\censuscope\india-districts-census-2011.xlsx",
     sheet_name="india-districts-census-2011"
 )
 
-state_df = pd.read_excel( r"C:\Users\aadya\OneDrive\Desktop\CS661_COURSE\censuscope\statewise_aggregated_data.xlsx")
+state_df = read_cached( r"C:\Users\aadya\OneDrive\Desktop\CS661_COURSE\censuscope\statewise_aggregated_data.xlsx")
 
 ATTRIBUTE_MAP = {
     "Population": ["Male", "Female"],
@@ -0,0 +1,252 @@
+# =========================
+# State Totals Derived from the District Counts
+# =========================
+
+# statewise_aggregated_data.* is the groupby-sum of the raw district counts
+# (india-districts-census-2011.xlsx) per state, and statewise_aggregated_data_percentages.*
+# adds the percentage_etl columns to it. This is the only writer of both files.
+# Rows can be districts or anything finer (sub-districts): only 'State name' and
+# the count columns are used.
+#
+# Two ways to bring the state table up to date:
+#   update(districts)   the whole source: one groupby-sum + percentages, then the
+#                       states whose row differs from before are reported, and the
+#                       files are only rewritten when one did
+#   apply(removed, added)   a change set (old and new versions of the edited rows):
+#                       only the affected states' sums are adjusted by the delta and
+#                       only their _pct values recomputed, so the cost follows the
+#                       size of the change, not of the source
+#
+#   python state_rollup.py [source]                   (update the state files)
+#   python state_rollup.py report [source] [scale]    (full rebuild vs one-row change timings)
+
+import copy
+import json
+import os
+import sys
+import time
+import numpy as np
+import pandas as pd
+from columnar_cache import read_cached
+from percentage_etl import percentage_matrix, write_outputs
+
+SOURCE = 'india-districts-census-2011.xlsx'
+COUNTS_STEM = 'statewise_aggregated_data'
+PERCENTAGES_STEM = 'statewise_aggregated_data_percentages'
+ROWS_FILE = '.state_rollup.json'
+KEY = 'State name'
+
+
+def count_columns(districts):
+    """Numeric columns to sum (District code is summed too, as in the existing workbook)"""
+    return [col for col in districts.columns if col != KEY and pd.api.types.is_numeric_dtype(districts[col])
+            and '%' not in str(col) and not str(col).endswith('_pct')]
+
+
+def state_totals(districts, cols):
+    """One row per state (sorted by name): the sums of the count columns"""
+    return districts[[KEY] + cols].groupby(KEY).sum()
+
+
+class StateRollup:
+    """State counts and percentages, kept up to date from district rows.
+
+    The tables are a few dozen state rows held as float64 arrays (exact for counts
+    below 2**53); they are replaced, never modified in place, so copies are cheap."""
+
+    def __init__(self):
+        self.states = np.array([], dtype=object)   # sorted state names
+        self.count_cols, self.dtypes, self.pct_cols = [], {}, []
+        self.counts = np.empty((0, 0))
+        self.pct = np.empty((0, 0))
+        self.row_counts = np.array([], dtype=np.int64)   # source rows summed into each state
+
+    def copy(self):
+        return copy.copy(self)
+
+    def _set(self, states, counts, row_counts, pct, changed):
+        """Replace the tables; `pct` holds the unchanged rows' percentages and is
+        filled in for the `changed` rows"""
+        if changed.any():
+            pct[changed] = percentage_matrix(counts[changed], self.count_cols)[1]
+        self.states, self.counts, self.pct, self.row_counts = states, counts, pct, row_counts
+
+    def update(self, districts):
+        """Rebuild from the whole source with one groupby-sum; returns (changed, removed) states"""
+        cols = count_columns(districts)
+        totals = state_totals(districts, cols)
+        states = totals.index.to_numpy(dtype=object)
+        counts = totals.to_numpy(dtype=np.float64)
+        row_counts = districts.groupby(KEY).size().to_numpy(dtype=np.int64)
+
+        removed = sorted(set(self.states) - set(states))
+        same = np.zeros(len(states), dtype=bool)
+        if cols == self.count_cols and len(self.states):
+            old = np.searchsorted(self.states, states).clip(max=len(self.states) - 1)
+            known = self.states[old] == states
+            before, after = self.counts[old[known]], counts[known]
+            same[known] = ((before == after) | (np.isnan(before) & np.isnan(after))).all(axis=1)
+        else:
+            self.count_cols, self.dtypes = cols, totals.dtypes.to_dict()
+            self.pct_cols = percentage_matrix(np.empty((0, len(cols))), cols)[0]
+        pct = np.empty((len(states), len(self.pct_cols)))
+        if same.any():
+            pct[same] = self.pct[old[same]]
+        changed = ~same
+        self._set(states, counts, row_counts, pct, changed)
+        return list(states[changed]), removed
+
+    def apply(self, removed_rows=None, added_rows=None):
+        """Apply a change set: `removed_rows` are the old versions of edited or deleted
+        rows, `added_rows` the new versions of edited or added rows. Only the states
+        they touch are recomputed; returns (changed, removed) states."""
+        names, values, signs = [], [], []
+        for frame, sign in ((added_rows, 1), (removed_rows, -1)):
+            if frame is not None and len(frame):
+                frame = frame[frame[KEY].notna()]
+                names.append(frame[KEY].to_numpy(dtype=object))
+                values.append(frame[self.count_cols].to_numpy(dtype=np.float64) * sign)
+                signs.append(np.full(len(frame), sign, dtype=np.int64))
+        if not names:
+            return [], []
+        touched, inverse = np.unique(np.concatenate(names), return_inverse=True)
+        delta = np.zeros((len(touched), len(self.count_cols)))
+        np.add.at(delta, inverse, np.concatenate(values))
+        delta_rows = np.bincount(inverse, weights=np.concatenate(signs), minlength=len(touched)).astype(np.int64)
+
+        # States seen for the first time start from zero
+        new = touched[~np.isin(touched, self.states)]
+        states = np.union1d(self.states, new) if len(new) else self.states
+        at = np.searchsorted(states, self.states)
+        counts = np.zeros((len(states), len(self.count_cols)))
+        counts[at] = self.counts
+        row_counts = np.zeros(len(states), dtype=np.int64)
+        row_counts[at] = self.row_counts
+        pos = np.searchsorted(states, touched)
+        counts[pos] += delta
+        row_counts[pos] += delta_rows
+
+        changed = np.zeros(len(states), dtype=bool)
+        changed[pos] = True
+        pct = np.empty((len(states), len(self.pct_cols)))
+        pct[at] = self.pct
+        # A state with no source rows left is dropped
+        keep = row_counts > 0
+        gone = list(states[~keep])
+        self._set(states[keep], counts[keep], row_counts[keep], pct[keep], changed[keep])
+        return list(self.states[changed[keep]]), gone
+
+    def counts_frame(self):
+        frame = pd.DataFrame(self.counts, columns=self.count_cols).astype(self.dtypes)
+        frame.insert(0, KEY, pd.array(self.states, dtype='str'))
+        return frame
+
+    def percentages(self):
+        return pd.concat([self.counts_frame(), pd.DataFrame(self.pct, columns=self.pct_cols)], axis=1)
+
+    def save(self, folder='.', formats=('csv', 'parquet', 'xlsx')):
+        """Write the counts and percentages in every format, then the row counts they match"""
+        write_outputs(self.counts_frame(), os.path.join(folder, COUNTS_STEM), formats)
+        write_outputs(self.percentages(), os.path.join(folder, PERCENTAGES_STEM), formats)
+        with open(os.path.join(folder, ROWS_FILE), 'w') as f:
+            json.dump(dict(zip(map(str, self.states), map(int, self.row_counts))), f, indent=1, sort_keys=True)
+
+    @classmethod
+    def load(cls, folder='.'):
+        """The rollup saved in `folder`, or an empty one if it is missing"""
+        rollup = cls()
+        try:
+            with open(os.path.join(folder, ROWS_FILE)) as f:
+                row_counts = json.load(f)
+            table = pd.read_parquet(os.path.join(folder, PERCENTAGES_STEM + '.parquet'))
+        except (OSError, ValueError):
+            return rollup
+        table = table.sort_values(KEY, kind='stable')
+        rollup.states = table[KEY].to_numpy(dtype=object)
+        rollup.count_cols = [col for col in table.columns if col != KEY and not str(col).endswith('_pct')]
+        rollup.pct_cols = [col for col in table.columns if str(col).endswith('_pct')]
+        rollup.dtypes = table[rollup.count_cols].dtypes.to_dict()
+        rollup.counts = table[rollup.count_cols].to_numpy(dtype=np.float64)
+        rollup.pct = table[rollup.pct_cols].to_numpy(dtype=np.float64)
+        rollup.row_counts = np.array([row_counts.get(state, 0) for state in rollup.states], dtype=np.int64)
+        return rollup
+
+
+def read_districts(path):
+    """The source rows, parsed once and then memory-mapped (see columnar_cache.py)"""
+    return read_cached(path)
+
+
+def update_state_files(source=SOURCE, folder='.'):
+    """Rebuild the state tables from the district source and rewrite the files if a state changed"""
+    start = time.perf_counter()
+    districts = read_districts(source)
+    rollup = StateRollup.load(folder)
+    changed, removed = rollup.update(districts)
+    if changed or removed:
+        rollup.save(folder)
+    print(f"{source}: {len(changed)} states changed, {len(removed)} removed, "
+          f"{len(rollup.states)} states in total ({(time.perf_counter() - start) * 1000:.1f} ms)")
+    for state in changed:
+        print(f"  changed {state}")
+    return rollup
+
+
+def same_values(frame, path):
+    """`frame` equals the workbook at `path` up to the 15 significant digits xlsx keeps"""
+    try:
+        pd.testing.assert_frame_equal(frame, pd.read_excel(path), check_exact=False, rtol=1e-13)
+    except AssertionError:
+        return False
+    return True
+
+
+def rollup_report(source=SOURCE, scale=1, repeats=5):
+    """Time a full rebuild against applying a one-row correction; True if both agree
+    and the change set is faster. scale > 1 repeats every row that many times, to
+    mimic finer (sub-district) rows."""
+    districts = read_districts(source)
+    if scale > 1:
+        districts = pd.concat([districts] * scale, ignore_index=True)
+    row = len(districts) // 2
+    edited = districts.copy()
+    edited.loc[row, 'Population'] += 1
+    before, after = districts.iloc[[row]], edited.iloc[[row]]
+
+    def best_ms(fn):
+        times = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            fn()
+            times.append((time.perf_counter() - start) * 1000)
+        return min(times)
+
+    base = StateRollup()
+    base.update(districts)
+    full_ms = best_ms(lambda: StateRollup().update(edited))
+    delta_ms = best_ms(lambda: base.copy().apply(before, after))
+
+    rollup = base.copy()
+    changed, _ = rollup.apply(before, after)
+    rebuilt = StateRollup()
+    rebuilt.update(edited)
+    same = rollup.percentages().equals(rebuilt.percentages())
+    faster = delta_ms < full_ms
+
+    print(f"{source} x{scale}: {len(districts)} rows, {len(base.states)} states, {len(base.count_cols)} count columns")
+    print(f"  {'full rebuild (groupby-sum + percentages)':<52} {full_ms:8.2f} ms")
+    print(f"  {'one-row change set, ' + ', '.join(changed) + ' recomputed':<52} {delta_ms:8.2f} ms  "
+          f"(same as a full rebuild: {same}, faster: {faster})")
+    if scale == 1:
+        for stem, frame in ((COUNTS_STEM, base.counts_frame()), (PERCENTAGES_STEM, base.percentages())):
+            if os.path.exists(stem + '.xlsx'):
+                print(f"  matches {stem}.xlsx: {same_values(frame, stem + '.xlsx')}")
+    return same and faster
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ['report']:
+        ok = rollup_report(*sys.argv[2:3], *map(int, sys.argv[3:4]))
+        sys.exit(0 if ok else 1)
+    else:
+        update_state_files(*sys.argv[1:2])
@@ -7,7 +7,7 @@ from dash import html, dcc
 
 # Import modular components
 from config.settings import FONT_FAMILY, COLORS
-from data.loader import load_geojson_data, load_state_data, load_district_data, categorize_attributes
+from data.loader import load_geojson_data, load_state_data, load_district_data, categorize_attributes, start_data_watcher
 from layouts.main_layout import create_main_layout
 from callbacks import register_all_callbacks
 
@@ -148,4 +148,5 @@ if __name__ == '__main__':
     print("🚀 Enjoy exploring India's demographic insights!")
     print("=" * 70)
     
+    start_data_watcher()   # hot-reload the census files when they change
     app.run(debug=True, host='127.0.0.1', port=8080)
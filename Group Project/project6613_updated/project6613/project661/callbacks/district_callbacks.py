@@ -7,15 +7,15 @@ import plotly.express as px
 import plotly.graph_objects as go
 import pandas as pd
 import json
-from data.loader import load_district_data
+from data.loader import load_district_data, get_snapshot
 from utils.helpers import get_district_short_label
 from config.settings import FONT_FAMILY, CSV_TO_GEOJSON_MAPPING, DISTRICT_ATTRIBUTE_CATEGORIES
 
 def register_district_callbacks(app):
     """Register all district analysis callbacks"""
     
-    # Load data
-    district_data = load_district_data()
+    # Load data (callbacks read get_snapshot() once per request, so a reload never lands mid-request)
+    load_district_data()
     
     # District state dropdown callback
     @app.callback(
@@ -24,6 +24,7 @@ def register_district_callbacks(app):
     )
     def update_district_state_dropdown(_):
         """Populate state dropdown for district analysis"""
+        district_data = get_snapshot().district_frame()
         if district_data.empty:
             return []
         
@@ -37,17 +38,18 @@ def register_district_callbacks(app):
     )
     def update_district_attribute_dropdown(selected_state):
         """Update district attribute dropdown based on available data"""
-        if not selected_state or district_data.empty:
+        snapshot = get_snapshot()
+        if not selected_state or snapshot.district_frame().empty:
             return []
         
-        # Get all percentage columns available for the selected state
-        state_data = district_data[district_data['State name'] == selected_state]
+        # Get all percentage columns available (loaded or not)
+        catalog = set(snapshot.district_percentage_cols)
         available_cols = []
         
         for category, attributes in DISTRICT_ATTRIBUTE_CATEGORIES.items():
             category_attrs = []
             for attr in attributes:
-                if attr in state_data.columns:
+                if attr in catalog:
                     category_attrs.append({
                         "label": f"  {get_district_short_label(attr)}",
                         "value": attr
@@ -134,7 +136,7 @@ def register_district_callbacks(app):
                 state_geo = json.load(f)
             
             # Get district data for selected state
-            state_districts = district_data[district_data['State name'] == selected_state].copy()
+            state_districts = get_snapshot().state_districts(selected_state, [selected_attribute])
             
             if selected_attribute and selected_attribute in state_districts.columns:
                 # Create choropleth map with data
@@ -266,7 +268,7 @@ def register_district_callbacks(app):
         
         try:
             # Get district data for selected state
-            state_districts = district_data[district_data['State name'] == selected_state].copy()
+            state_districts = get_snapshot().state_districts(selected_state, [selected_attribute])
             
             if selected_attribute and selected_attribute in state_districts.columns:
                 # Sort districts by selected attribute
@@ -416,7 +418,7 @@ def register_district_callbacks(app):
             return placeholder_fig
         
         try:
-            state_districts = district_data[district_data['State name'] == selected_state].copy()
+            state_districts = get_snapshot().state_districts(selected_state, [selected_attribute, 'Literate_%'])
             
             if selected_attribute and selected_attribute in state_districts.columns:
                 # Create performance vs literacy scatter plot
@@ -554,7 +556,7 @@ def register_district_callbacks(app):
         
         try:
             # Filter data for selected state
-            state_districts = district_data[district_data['State name'] == selected_state].copy()
+            state_districts = get_snapshot().state_districts(selected_state, [selected_attribute, 'Literate_%', 'Workers_%', 'Male_%', 'Female_%'])
             
             if state_districts.empty:
                 return html.Div([
@@ -7,7 +7,7 @@ from dash.dependencies import State
 import plotly.express as px
 import plotly.graph_objects as go
 import pandas as pd
-from data.loader import load_state_data, load_geojson_data
+from data.loader import load_state_data, load_geojson_data, get_snapshot
 from utils.helpers import get_short_label
 from utils.insights import generate_insights, create_insights_layout
 from config.settings import FONT_FAMILY, STATE_NAME_MAPPING, ATTRIBUTE_CATEGORIES
@@ -16,6 +16,7 @@ def register_state_callbacks(app):
     """Register all state analysis callbacks"""
     
     # Load data
+    # Callbacks read get_snapshot() once per request, so a data reload never lands mid-request
     state_data = load_state_data()
     india_geo = load_geojson_data()
     print("DEBUG: Loaded state_data shape:", state_data.shape)
@@ -33,8 +34,8 @@ def register_state_callbacks(app):
         
         attributes = ATTRIBUTE_CATEGORIES.get(selected_category, [])
         print("DEBUG: Available attributes for category", selected_category, ":", attributes)
-        print("DEBUG: State data columns:", state_data.columns)
-        print([col for col in state_data.columns if "christ" in col.lower()])
+        print("DEBUG: State data columns:", get_snapshot().pct_cols)
+        print([col for col in get_snapshot().pct_cols if "christ" in col.lower()])
         return [{"label": get_short_label(attr), "value": attr} for attr in attributes]
     
 
@@ -46,7 +47,7 @@ def register_state_callbacks(app):
     def update_india_map(selected_attribute):
         print("DEBUG: update_india_map called with selected_attribute:", selected_attribute)
         """Update India choropleth map based on selected attribute"""
-        print("DEBUG: Unique states in state_data:", state_data['State name'].unique())
+        print("DEBUG: Unique states in state_data:", load_state_data()['State name'].unique())
         # Show default India map if no attribute selected
         if not selected_attribute:
             try:
@@ -130,9 +131,8 @@ def register_state_callbacks(app):
         try:
             print("DEBUG: Attribute selected, preparing choropleth for:", selected_attribute)
             # Prepare data for visualization
-            # viz_data = state_data[['State name', selected_attribute]].dropna()
-            viz_data = state_data[['State name', selected_attribute]].dropna()
-            viz_data = viz_data.groupby('State name')[selected_attribute].mean().reset_index()
+            state_aggregates = get_snapshot().state_aggregates
+            viz_data = state_aggregates.frame(selected_attribute)
             
             # Map CSV state names to GeoJSON state names for choropleth
             viz_data['Mapped_State'] = viz_data['State name'].map(STATE_NAME_MAPPING)
@@ -253,9 +253,8 @@ def register_state_callbacks(app):
         
         try:
             # Prepare data for rankings
-            rankings_data = state_data[['State name', selected_attribute]].dropna()
-            rankings_data = rankings_data.groupby('State name')[selected_attribute].mean().reset_index()
-            rankings_data = rankings_data.sort_values(selected_attribute, ascending=False).reset_index(drop=True)
+            state_aggregates = get_snapshot().state_aggregates
+            rankings_data = state_aggregates.ranked(selected_attribute)
             
             # Take top 15 and bottom 5 states for better visualization
             if len(rankings_data) > 20:
@@ -407,8 +406,9 @@ def register_state_callbacks(app):
         
         try:
             # Prepare data for box plot
-            box_data = state_data[['State name', selected_attribute]].dropna()
-            box_data = box_data.groupby('State name')[selected_attribute].mean().reset_index()
+            state_aggregates = get_snapshot().state_aggregates
+            box_data = state_aggregates.frame(selected_attribute)
+            stats = state_aggregates.stats(selected_attribute)
             
             # Create beautiful box plot
             box_fig = go.Figure()
@@ -432,11 +432,11 @@ def register_state_callbacks(app):
             ))
             
             # Calculate statistics for annotations
-            q1 = box_data[selected_attribute].quantile(0.25)
-            median = box_data[selected_attribute].median()
-            q3 = box_data[selected_attribute].quantile(0.75)
-            mean_val = box_data[selected_attribute].mean()
-            std_val = box_data[selected_attribute].std()
+            q1 = stats['q25']
+            median = stats['median']
+            q3 = stats['q75']
+            mean_val = stats['mean']
+            std_val = stats['std']
             
             # Beautiful styling for box plot
             box_fig.update_layout(
@@ -552,14 +552,14 @@ def register_state_callbacks(app):
         
         try:
             # Prepare data for pie chart
-            pie_data = state_data[['State name', selected_attribute]].dropna()
-            pie_data = pie_data.groupby('State name')[selected_attribute].mean().reset_index()
+            state_aggregates = get_snapshot().state_aggregates
+            pie_data = state_aggregates.ranked(selected_attribute)
             
             # Get top 7 states
-            top_states = pie_data.nlargest(7, selected_attribute)
+            top_states = pie_data.head(7)
             
             # Calculate "Others" category for remaining states
-            remaining_states = pie_data[~pie_data['State name'].isin(top_states['State name'])]
+            remaining_states = pie_data.iloc[7:]
             others_total = remaining_states[selected_attribute].sum() if len(remaining_states) > 0 else 0
             
             # Create beautiful color palette for pie chart
@@ -629,7 +629,7 @@ def register_state_callbacks(app):
             )
             
             # Add center annotation for donut chart
-            total_avg = pie_data[selected_attribute].mean()
+            total_avg = state_aggregates.stats(selected_attribute)['mean']
             pie_fig.add_annotation(
                 text=f"<b>Avg</b><br>{total_avg:.1f}%",
                 x=0.5, y=0.5,
@@ -675,7 +675,7 @@ def register_state_callbacks(app):
             return create_insights_layout([], None)
         
         # Generate insights
-        insights = generate_insights(selected_attribute, state_data)
+        insights = generate_insights(selected_attribute, get_snapshot().state_aggregates)
         
         # Create layout
         return create_insights_layout(insights, selected_attribute)
@@ -731,12 +731,15 @@ def register_state_callbacks(app):
             ]
             
             # Filter available metrics based on what exists in the data
-            available_metrics = [metric for metric in correlation_metrics if metric in state_data.columns]
+            # (source dtypes of every column, whether it has been loaded yet or not)
+            snapshot = get_snapshot()
+            source_dtypes = snapshot.state_column_dtypes()
+            available_metrics = [metric for metric in correlation_metrics if metric in source_dtypes]
             
             # If not enough metrics, add more from available columns
             if len(available_metrics) < 8:
-                numeric_cols = [col for col in state_data.columns 
-                              if col != 'State name' and state_data[col].dtype in ['float64', 'int64'] 
+                numeric_cols = [col for col, dtype in source_dtypes.items()
+                              if col != 'State name' and dtype in ['float64', 'int64'] 
                               and col not in available_metrics]
                 available_metrics.extend(numeric_cols[:12-len(available_metrics)])
             
@@ -747,12 +750,8 @@ def register_state_callbacks(app):
             if selected_attribute not in final_metrics:
                 final_metrics = [selected_attribute] + final_metrics[:9]
             
-            # Prepare correlation data
-            corr_data = state_data[['State name'] + final_metrics].dropna()
-            corr_data = corr_data.groupby('State name').mean().reset_index()
-            
-            # Calculate correlation matrix
-            correlation_matrix = corr_data[final_metrics].corr()
+            # Correlation across states, from the per-state means
+            correlation_matrix = snapshot.state_aggregates.correlation(final_metrics)
             
             # Create short labels for better readability
             short_labels = [get_short_label(metric) for metric in final_metrics]
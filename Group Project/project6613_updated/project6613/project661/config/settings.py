@@ -2,6 +2,8 @@
 # CONFIGURATION SETTINGS
 # ===========================================
 
+import os
+
 # Color palette for beautiful dashboard
 COLORS = {
     'primary': '#6366f1',      # Indigo
@@ -23,6 +25,22 @@ COLORS = {
 # Global font settings for beautiful typography
 FONT_FAMILY = "Inter, -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif"
 
+# Opt-in compact in-memory tables (float32 percentages, categorical names) so more
+# workers fit on one host. Set PROJECT661_COMPACT=1 to enable; see data/compact.py
+COMPACT_DATA = os.environ.get("PROJECT661_COMPACT", "").lower() in ("1", "true", "yes")
+
+# Attribute columns read at startup; every other attribute is loaded from the
+# columnar cache the first time a callback asks for it (see data/column_store.py).
+# The state defaults are the metrics the correlation heatmap shows for every attribute.
+DEFAULT_STATE_ATTRIBUTES = [
+    "Male_Literate_pct", "Female_Literate_pct", "Male_SC_pct", "Female_SC_pct",
+    "Male_ST_pct", "Female_ST_pct", "Male_Workers_pct", "Female_Workers_pct"
+]
+DEFAULT_DISTRICT_ATTRIBUTES = ["Literate_%", "Workers_%", "Male_%", "Female_%"]
+
+# Seconds between checks of the census files for changes (hot reload, see data/snapshot.py)
+DATA_WATCH_INTERVAL = 2.0
+
 # Define attribute categories based on available percentage columns
 ATTRIBUTE_CATEGORIES = {
     "🏠 Demographics": [],
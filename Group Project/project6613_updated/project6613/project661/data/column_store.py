@@ -0,0 +1,100 @@
+# ===========================================
+# LAZY COLUMN STORE
+# ===========================================
+
+# A table loaded column by column from the columnar cache. Startup reads only the
+# identifier columns and a few default attributes; any other attribute in the
+# catalog is read (memory-mapped, one column at a time) the first time a callback
+# asks for it. Loaded columns are never dropped, and the table is replaced rather
+# than modified, so a frame a callback already holds stays valid. The store maps one
+# cache copy when it is created and reads every later column from that copy, so it
+# keeps serving the same version of the data even after the source is rebuilt.
+
+import threading
+import time
+from collections import Counter
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+from data.columnar_cache import ensure_cached
+
+
+class ColumnStore:
+    """Table whose attribute columns are faulted in from the columnar cache on first use"""
+
+    def __init__(self, path, key_cols, select, default_cols=(), sort_by=None, convert=None):
+        self.path = path
+        # (mtime, size) of the source bytes this table was parsed from
+        data_file, df, self.source_stamp = ensure_cached(path)
+        # Zero-copy view of the cache copy (or, if the copy could not be written, the
+        # parsed frame as Arrow); columns are converted to pandas on demand
+        self._table = (feather.read_table(data_file, memory_map=True) if data_file
+                       else pa.Table.from_pandas(df, preserve_index=False))
+        # Column -> dtype of the source, known without reading any data
+        self.dtypes = {field.name: np.dtype(field.type.to_pandas_dtype()) for field in self._table.schema}
+        self.key_cols = [col for col in key_cols if col in self.dtypes]
+        self.catalog = [col for col in self.dtypes if col not in self.key_cols and select(col)]
+        self._catalog = frozenset(self.catalog)
+        self.convert = convert
+        self._lock = threading.Lock()
+        self._metrics_lock = threading.Lock()
+        self.requests = Counter()
+        self.hits = 0
+        self.faults = 0
+        self.fault_ms = 0.0
+
+        start = time.perf_counter()
+        keys = self._table.select(self.key_cols).to_pandas()
+        # Row order applied to every column, e.g. rows grouped by state
+        self.order = (keys.sort_values(sort_by, kind='stable').index.to_numpy() if sort_by
+                      else np.arange(len(keys)))
+        self.frame = self._convert(keys.iloc[self.order].reset_index(drop=True), [])
+        self.require([col for col in default_cols if col in self.catalog], count=False)
+        self.startup_ms = (time.perf_counter() - start) * 1000
+
+    def _convert(self, frame, value_cols):
+        # convert(frame, value_cols) -> frame, e.g. data.compact.compact_frame
+        return self.convert(frame, value_cols) if self.convert else frame
+
+    def _read(self, cols):
+        columns = self._table.select(cols).to_pandas().iloc[self.order].reset_index(drop=True)
+        return self._convert(columns, cols)
+
+    def require(self, cols, count=True):
+        """Make sure the catalog columns in `cols` are loaded; returns the current frame"""
+        cols = [col for col in cols if col in self._catalog]
+        frame = self.frame
+        missing = [col for col in cols if col not in frame.columns]
+        if missing:
+            with self._lock:
+                # Another thread may have loaded them while this one waited
+                missing = [col for col in missing if col not in self.frame.columns]
+                if missing:
+                    start = time.perf_counter()
+                    self.frame = pd.concat([self.frame, self._read(missing)], axis=1)
+                    self.fault_ms += (time.perf_counter() - start) * 1000
+                    self.faults += len(missing)
+                frame = self.frame
+        if count and cols:
+            with self._metrics_lock:
+                self.requests.update(cols)
+                self.hits += not missing
+        return frame
+
+    def columns(self):
+        """Key columns followed by the whole catalog, in source order (loaded or not)"""
+        return self.key_cols + self.catalog
+
+    def loaded(self):
+        return [col for col in self.frame.columns if col not in self.key_cols]
+
+    def metrics(self):
+        return dict(loaded=len(self.loaded()), catalog=len(self.catalog), hits=self.hits,
+                    faults=self.faults, fault_ms=self.fault_ms, startup_ms=self.startup_ms,
+                    top=self.requests.most_common(5))
+
+    def summary(self):
+        m = self.metrics()
+        return (f"{m['loaded']}/{m['catalog']} columns loaded, {m['hits']} hits, {m['faults']} faulted in "
+                f"({m['fault_ms']:.1f} ms), startup {m['startup_ms']:.1f} ms")
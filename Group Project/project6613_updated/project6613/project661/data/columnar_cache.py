@@ -0,0 +1,164 @@
+# =========================
+# Columnar Cache for CSV / XLSX Sources
+# =========================
+
+# read_cached(path) returns the same DataFrame as pd.read_excel / pd.read_csv, but
+# parses the source only once: the result is written next to it as an uncompressed
+# Feather (Arrow IPC) file and later loads memory-map that copy. Each copy carries a
+# stamp (source mtime, size and SHA-256); a changed mtime or size re-hashes the source
+# and the copy is rebuilt only when the content really changed. Copies are named after
+# the content hash and never overwritten, so a table still memory-mapping an older copy
+# (a data snapshot serving in-flight requests) keeps reading the version it started with.
+#
+#   python -m data.columnar_cache statewiseaggregated.csv ...   (cold vs warm timings)
+
+import glob
+import hashlib
+import io
+import json
+import os
+import sys
+import time
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+CACHE_DIR = ".columnar_cache"
+READERS = {'.xlsx': pd.read_excel, '.xls': pd.read_excel, '.csv': pd.read_csv}
+
+
+def file_hash(path, chunk=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        while True:
+            block = f.read(chunk)
+            if not block:
+                break
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def cache_paths(path, read_kwargs):
+    """Prefix of the Feather copies and the stamp file for one source + reader arguments"""
+    folder = os.path.join(os.path.dirname(os.path.abspath(path)), CACHE_DIR)
+    options = json.dumps(read_kwargs, sort_keys=True, default=str)
+    key = hashlib.sha1(options.encode()).hexdigest()[:8]
+    base = os.path.join(folder, f"{os.path.basename(path)}.{key}")
+    return base, base + ".json"
+
+
+def _to_arrow(df):
+    """Arrow table of a frame; mixed-type object columns are stored as text"""
+    try:
+        return pa.Table.from_pandas(df, preserve_index=False)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        mixed = [c for c in df.columns if df[c].dtype == object]
+        return pa.Table.from_pandas(df.astype({c: str for c in mixed}), preserve_index=False)
+
+
+def ensure_cached(path, **read_kwargs):
+    """Up-to-date Feather copy of the source, its frame if the copy had to be (re)built,
+    and the (mtime, size) of the source bytes they hold. The copy is None when it could
+    not be written; the frame is then always returned."""
+    base, stamp_file = cache_paths(path, read_kwargs)
+    stat = os.stat(path)
+    stamp = _read_stamp(stamp_file)
+    data_file = os.path.join(os.path.dirname(stamp_file), stamp['file']) if stamp else None
+    if data_file and os.path.exists(data_file):
+        fresh = stamp['mtime'] == stat.st_mtime and stamp['size'] == stat.st_size
+        if not fresh and stamp['size'] == stat.st_size and stamp['sha256'] == file_hash(path):
+            # Touched but not changed (checkout, copy): keep the copy, refresh the stamp
+            fresh = True
+            try:
+                _write_stamp(stamp_file, stat, stamp['sha256'], stamp['file'])
+            except OSError:
+                pass   # the copy is still right; the next load re-hashes
+        if fresh:
+            return data_file, None, (stat.st_mtime, stat.st_size)
+
+    # Stat, then read the bytes once and hash and parse those same bytes, so the copy and
+    # its stamp always describe one version of the source; a rewrite after the stat moves
+    # the mtime, and the next load re-hashes and rebuilds
+    stat = os.stat(path)
+    with open(path, 'rb') as f:
+        raw = f.read()
+    sha256 = hashlib.sha256(raw).hexdigest()
+    reader = READERS[os.path.splitext(path)[1].lower()]
+    table = _to_arrow(reader(io.BytesIO(raw), **read_kwargs))
+    data_file = f"{base}.{sha256[:12]}.feather"
+    try:
+        os.makedirs(os.path.dirname(data_file), exist_ok=True)
+        if not os.path.exists(data_file):
+            # Write then rename so a reader never maps a half-written file
+            feather.write_feather(table, data_file + ".tmp", compression='uncompressed')
+            os.replace(data_file + ".tmp", data_file)
+        _write_stamp(stamp_file, stat, sha256, os.path.basename(data_file))
+    except OSError as e:
+        # Read-only deploy or full disk: serve the parsed frame, there is no copy to map
+        print(f"columnar cache: {path} not cached ({e})")
+        return None, table.to_pandas(), (stat.st_mtime, stat.st_size)
+    _remove_old_copies(base, data_file)
+    # The frame a warm load returns (same dtypes), not the one the reader parsed
+    return data_file, table.to_pandas(), (stat.st_mtime, stat.st_size)
+
+
+def read_cached(path, columns=None, **read_kwargs):
+    """pd.read_excel / pd.read_csv through the columnar cache (rebuilt when the source changes).
+    With `columns`, only those columns are read from the memory-mapped copy."""
+    data_file, df, _ = ensure_cached(path, **read_kwargs)
+    if df is not None:
+        return df if columns is None else df[list(columns)]
+    table = feather.read_table(data_file, columns=None if columns is None else list(columns), memory_map=True)
+    return table.to_pandas()
+
+
+def _read_stamp(stamp_file):
+    """Stamp dict, or None if there is no (current-format) stamp"""
+    if not os.path.exists(stamp_file):
+        return None
+    with open(stamp_file, encoding="utf-8") as f:
+        stamp = json.load(f)
+    return stamp if 'file' in stamp else None
+
+
+def _write_stamp(stamp_file, stat, sha256, data_name):
+    with open(stamp_file + ".tmp", "w", encoding="utf-8") as f:
+        json.dump({'mtime': stat.st_mtime, 'size': stat.st_size, 'sha256': sha256, 'file': data_name}, f)
+    os.replace(stamp_file + ".tmp", stamp_file)
+
+
+def _remove_old_copies(base, keep):
+    # An old copy still mapped by a running table cannot be deleted on Windows;
+    # it is left for the next rebuild to remove
+    for old in glob.glob(glob.escape(base) + ".*.feather") + [base + ".feather"]:
+        if old != keep and os.path.exists(old):
+            try:
+                os.remove(old)
+            except OSError:
+                pass
+
+
+def clear_cache(path, **read_kwargs):
+    base, stamp_file = cache_paths(path, read_kwargs)
+    for cached in glob.glob(glob.escape(base) + ".*.feather") + [base + ".feather", stamp_file]:
+        if os.path.exists(cached):
+            os.remove(cached)
+
+
+def startup_report(paths):
+    """Cold (parse source + write copy) vs warm (memory-mapped copy) load time per source"""
+    for path in paths:
+        clear_cache(path)
+        start = time.perf_counter()
+        cold = read_cached(path)
+        cold_ms = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        warm = read_cached(path)
+        warm_ms = (time.perf_counter() - start) * 1000
+        print(f"{os.path.basename(path):>48}: cold {cold_ms:8.1f} ms, warm {warm_ms:6.1f} ms "
+              f"({cold_ms / warm_ms:5.0f}x), {cold.shape[0]}x{cold.shape[1]}, same frame: {cold.equals(warm)}")
+
+
+if __name__ == "__main__":
+    startup_report(sys.argv[1:] or ["statewiseaggregated.csv", "districtwise_data_percentages11_incsv.csv",
+                                    "districtwise_data_percentages11.xlsx"])
@@ -0,0 +1,90 @@
+# ===========================================
+# COMPACT IN-MEMORY TABLES
+# ===========================================
+
+# Opt-in (config.settings.COMPACT_DATA) smaller copies of the loaded tables:
+# percentage columns as float32 and the name columns as categoricals whose
+# categories are interned, so the state names in the state and district tables
+# are the same string objects. Percentages keep ~7 significant digits, far more
+# than the two decimals the dashboards display.
+#
+#   python -m data.compact districtwise_data_percentages11_incsv.csv statewiseaggregated.csv
+
+import sys
+import numpy as np
+import pandas as pd
+from data.columnar_cache import read_cached
+
+NAME_COLUMNS = ('State name', 'District name')
+INT16_SCALE = 100   # scaled int16 keeps two decimals of a 0-327.67 range
+
+
+def intern_categorical(series):
+    """Series as a categorical with interned category strings"""
+    categorical = series.astype('category')
+    categories = [sys.intern(str(name)) for name in categorical.cat.categories]
+    return categorical.cat.rename_categories(categories)
+
+
+def compact_frame(frame, value_cols):
+    """Copy of `frame` with float32 value columns and categorical name columns"""
+    compact = frame.copy()
+    for col in value_cols:
+        compact[col] = pd.to_numeric(compact[col], errors='coerce').astype(np.float32)
+    for col in NAME_COLUMNS:
+        if col in compact.columns:
+            compact[col] = intern_categorical(compact[col])
+    return compact
+
+
+def to_int16(values):
+    """Scaled int16 encoding (NaN -> -32768) and whether every value fits"""
+    scaled = np.round(values * INT16_SCALE)
+    fits = bool(np.all(np.isnan(scaled) | ((scaled > -32768) & (scaled <= 32767))))
+    return np.where(np.isnan(scaled), -32768, np.clip(scaled, -32767, 32767)).astype(np.int16), fits
+
+
+def memory_mb(frame):
+    return frame.memory_usage(deep=True).sum() / 1e6
+
+
+def accuracy_check(original, compact, value_cols):
+    """Largest error of the compact values and how many columns change their ranking"""
+    before = original[value_cols].apply(pd.to_numeric, errors='coerce').to_numpy(dtype=np.float64)
+    after = compact[value_cols].to_numpy(dtype=np.float64)
+    same_missing = bool(np.array_equal(np.isnan(before), np.isnan(after)))
+    error = np.abs(before - after)
+    reordered = sum(
+        not np.array_equal(np.argsort(-before[:, j], kind='stable'), np.argsort(-after[:, j], kind='stable'))
+        for j in range(before.shape[1])
+    )
+    return dict(max_abs=np.nanmax(error, initial=0.0), max_display=np.nanmax(
+        np.abs(np.round(before, 2) - np.round(after, 2)), initial=0.0),
+        same_missing=same_missing, reordered=reordered)
+
+
+def compact_report(paths):
+    """Memory of each table as loaded vs compact, with accuracy of the float32 and int16 encodings"""
+    for path in paths:
+        frame = read_cached(path)
+        value_cols = [c for c in frame.columns if '%' in str(c) or str(c).endswith('_pct')]
+        frame = frame[[c for c in NAME_COLUMNS if c in frame.columns] + value_cols]
+        compact = compact_frame(frame, value_cols)
+        check = accuracy_check(frame, compact, value_cols)
+
+        values = frame[value_cols].to_numpy(dtype=np.float64)
+        encoded, fits = to_int16(values)
+        decoded = np.where(encoded == -32768, np.nan, encoded / INT16_SCALE)
+        int16_mb = memory_mb(compact.drop(columns=value_cols)) + encoded.nbytes / 1e6
+
+        print(f"{path}: {len(frame)} rows, {len(value_cols)} value columns")
+        print(f"  as loaded        {memory_mb(frame):8.2f} MB")
+        print(f"  compact float32  {memory_mb(compact):8.2f} MB  max error {check['max_abs']:.2e}, "
+              f"2-decimal display changed by {check['max_display']:.2f}, "
+              f"missing values kept: {check['same_missing']}, rankings changed in {check['reordered']} columns")
+        print(f"  scaled int16     {int16_mb:8.2f} MB  max error {np.nanmax(np.abs(values - decoded)):.2e}, "
+              f"all values in range: {fits}")
+
+
+if __name__ == "__main__":
+    compact_report(sys.argv[1:] or ["districtwise_data_percentages11_incsv.csv", "statewiseaggregated.csv"])
@@ -3,22 +3,41 @@
 # ===========================================
 
 import pandas as pd
+import numpy as np
 import json
+import sys
+import threading
+import time
 import os
+from data.columnar_cache import read_cached
+from data.state_aggregates import StateAggregates
+from data.compact import compact_frame, memory_mb
+from data.column_store import ColumnStore
+from data.snapshot import DataSnapshot, DataWatcher, source_stamp
 from config.settings import (
     ATTRIBUTE_CATEGORIES, 
     DISTRICT_ATTRIBUTE_CATEGORIES, 
-    CSV_TO_GEOJSON_MAPPING
+    CSV_TO_GEOJSON_MAPPING,
+    COMPACT_DATA,
+    DEFAULT_STATE_ATTRIBUTES,
+    DEFAULT_DISTRICT_ATTRIBUTES,
+    DATA_WATCH_INTERVAL
 )
 
+STATE_CSV = "C:\\Users\\Vibha Narayan\\OneDrive\\Desktop\\coding\\GitDemo\\CS661\\Group Project\\project6613_updated\\project6613\\project661\\statewiseaggregated.csv"
+DISTRICT_CSV = "C:\\Users\\Vibha Narayan\\OneDrive\\Desktop\\coding\\GitDemo\\CS661\\Group Project\\project6613_updated\\project6613\\project661\\districtwise_data_percentages11_incsv.csv"
+
 # Global data variables
 india_geo = None
-state_data = None
-district_data = None
 state_file_map = {}
 state_dropdown_options = []
-pct_cols = []
-district_percentage_cols = []
+
+# The census tables live in an append-only DataSnapshot (data/snapshot.py). Callbacks
+# read it through get_snapshot() / the getters below, once per request; reload_data()
+# builds the next version and replaces this reference in one assignment.
+snapshot = None
+_reload_lock = threading.Lock()
+_watcher = None
 
 def load_geojson_data():
     """Load India GeoJSON for state boundaries"""
@@ -32,37 +51,134 @@ def load_geojson_data():
         print(f"❌ Error loading india.json: {e}")
         return {}
 
-def load_state_data():
-    """Load State-wise aggregated data (only percentage columns)"""
-    global state_data, pct_cols
+def build_state_store(previous=None):
+    """State-wise aggregated data (only percentage columns); `previous` is kept if the file fails to load"""
     try:
-        state_data_full = pd.read_csv("C:\\Users\\Vibha Narayan\\OneDrive\\Desktop\\coding\\GitDemo\\CS661\\Group Project\\project6613_updated\\project6613\\project661\\statewiseaggregated.csv")
-        # Filter only percentage columns (ending with '_pct') + essential columns
+        # Only percentage columns (ending with '_pct') + essential columns; of those only
+        # the defaults are read now, the rest on first use
         essential_cols = ['State name', 'District code', 'Population']
-        pct_cols = [col for col in state_data_full.columns if col.endswith('_pct')]
-        state_data = state_data_full[essential_cols + pct_cols]
-        print(f"✅ State data loaded: {len(state_data)} rows, {len(pct_cols)} percentage columns")
-        return state_data
+        store = ColumnStore(STATE_CSV, essential_cols, select=lambda col: col.endswith('_pct'),
+                            default_cols=DEFAULT_STATE_ATTRIBUTES,
+                            convert=compact_frame if COMPACT_DATA else None)
+        if COMPACT_DATA:
+            print(f"🗜️ State data compacted: {memory_mb(store.frame):.2f} MB")
+        print(f"✅ State data loaded: {len(store.frame)} rows, {len(store.catalog)} percentage columns "
+              f"({store.summary()})")
+        return store
     except Exception as e:
         print(f"❌ Error loading statewiseaggregated.csv: {e}")
-        state_data = pd.DataFrame()
-        return state_data
+        return previous
 
-def load_district_data():
-    """Load District-wise data (only percentage columns with % symbol)"""
-    global district_data, district_percentage_cols
+def build_district_store(previous=None):
+    """District-wise data (only percentage columns with % symbol); `previous` is kept if the file fails to load"""
     try:
-        district_data_full = pd.read_csv("C:\\Users\\Vibha Narayan\\OneDrive\\Desktop\\coding\\GitDemo\\CS661\\Group Project\\project6613_updated\\project6613\\project661\\districtwise_data_percentages11_incsv.csv")
-        # Filter only percentage columns (containing '%' symbol) + essential columns
+        # Only percentage columns (containing '%' symbol) + essential columns; of those
+        # only the defaults are read now, the rest on first use.
+        # Rows grouped by state so each state is one contiguous, zero-copy slice
         essential_cols_district = ['State name', 'District name']
-        district_percentage_cols = [col for col in district_data_full.columns if '%' in str(col)]
-        district_data = district_data_full[essential_cols_district + district_percentage_cols]
-        print(f"✅ District data loaded: {len(district_data)} rows, {len(district_percentage_cols)} percentage columns")
-        return district_data
+        store = ColumnStore(DISTRICT_CSV, essential_cols_district, select=lambda col: '%' in str(col),
+                            default_cols=DEFAULT_DISTRICT_ATTRIBUTES, sort_by='State name',
+                            convert=compact_frame if COMPACT_DATA else None)
+        if COMPACT_DATA:
+            print(f"🗜️ District data compacted: {memory_mb(store.frame):.2f} MB")
+        print(f"✅ District data loaded: {len(store.frame)} rows, {len(store.catalog)} percentage columns "
+              f"({store.summary()})")
+        return store
     except Exception as e:
         print(f"❌ Error loading districtwise_data_percentages11_incsv.csv: {e}")
-        district_data = pd.DataFrame()
-        return district_data
+        return previous
+
+def build_snapshot(previous=None):
+    """Next data version: reload changed sources, reuse unchanged tables, warm, return"""
+    version = previous.version + 1 if previous else 1
+    changed = previous.changed_sources() if previous else [STATE_CSV, DISTRICT_CSV]
+    attempted = {path: source_stamp(path) for path in changed}
+    old_state = previous.state_store if previous else None
+    old_district = previous.district_store if previous else None
+    state_store = build_state_store(old_state) if STATE_CSV in changed else old_state
+    district_store = build_district_store(old_district) if DISTRICT_CSV in changed else old_district
+
+    # Each table records the stamp of the exact bytes it was parsed from, so an edit
+    # made during the build shows up as a change and triggers another reload. A file
+    # that failed to load keeps the stamp seen before the attempt and is retried
+    # only once it changes again.
+    sources = {}
+    for path, store, old in ((STATE_CSV, state_store, old_state), (DISTRICT_CSV, district_store, old_district)):
+        if store is not None and (store is not old or path not in changed):
+            sources[path] = store.source_stamp
+        else:
+            sources[path] = attempted[path] if path in attempted else previous.sources[path]
+
+    if state_store is not None and state_store is old_state:
+        aggregates = previous.state_aggregates
+    elif state_store is not None:
+        # Per-state means, computed once per attribute for all state callbacks
+        aggregates = StateAggregates(state_store.frame, fetch=state_store.require)
+    else:
+        aggregates = StateAggregates(pd.DataFrame())
+    if district_store is not None and district_store is old_district:
+        index = previous.district_state_index
+    else:
+        index = state_row_ranges(district_store.frame) if district_store is not None else {}
+
+    new = DataSnapshot(version, sources, state_store, district_store, aggregates, index)
+    new.warm_from(previous)
+    return new
+
+def get_snapshot():
+    """Data version to serve the current request from (built on first use)"""
+    if snapshot is None:
+        with _reload_lock:
+            if snapshot is None:
+                _swap(build_snapshot())
+    return snapshot
+
+def _swap(new):
+    global snapshot
+    snapshot = new
+
+def reload_data():
+    """Build the next snapshot from the changed files and swap it in"""
+    with _reload_lock:
+        start = time.perf_counter()
+        previous = snapshot
+        new = build_snapshot(previous)
+        _swap(new)
+    print(f"🔄 Data version {new.version} live ({(time.perf_counter() - start) * 1000:.0f} ms to build and warm)")
+    return new
+
+def start_data_watcher(interval=DATA_WATCH_INTERVAL):
+    """Watch the census files and hot-reload them when they change"""
+    global _watcher
+    if _watcher is None:
+        get_snapshot()
+        _watcher = DataWatcher(lambda: snapshot, reload_data, interval).start()
+    return _watcher
+
+def load_state_data():
+    """Load State-wise aggregated data (only percentage columns)"""
+    return get_snapshot().state_frame()
+
+def load_district_data():
+    """Load District-wise data (only percentage columns with % symbol)"""
+    return get_snapshot().district_frame()
+
+def state_row_ranges(frame):
+    """[start, stop) row range of each state in a frame already grouped by state"""
+    names = frame['State name'].to_numpy()
+    starts = np.flatnonzero(np.r_[True, names[1:] != names[:-1]])
+    stops = np.r_[starts[1:], len(names)]
+    return {names[start]: (int(start), int(stop)) for start, stop in zip(starts, stops)}
+
+def build_state_index(frame):
+    """Sort rows by state (stable) and map each state to its [start, stop) row range"""
+    frame = frame.sort_values('State name', kind='stable').reset_index(drop=True)
+    return frame, state_row_ranges(frame)
+
+def get_state_districts(state_name, columns=()):
+    """Districts of one state as a row slice of district_data (no scan, no copy).
+    Attribute columns listed in `columns` are loaded first if needed."""
+    return get_snapshot().state_districts(state_name, columns)
 
 def create_state_file_mapping():
     """Create mapping for state names to their geojson files"""
@@ -84,12 +200,10 @@ def create_state_file_mapping():
 
 def categorize_attributes():
     """Categorize percentage columns into logical groups"""
-    global pct_cols
-    
     categories = ATTRIBUTE_CATEGORIES.copy()
     
     # Categorize state data columns
-    for col in pct_cols:
+    for col in get_pct_cols():
         col_lower = col.lower()
         if any(x in col_lower for x in ['male', 'female']):
             categories["🏠 Demographics"].append(col)
@@ -116,11 +230,11 @@ def categorize_attributes():
 
 def filter_district_categories():
     """Filter district categories based on available columns"""
-    global district_data
+    district_percentage_cols = get_district_percentage_cols()
     
     filtered_categories = {}
     for category, attributes in DISTRICT_ATTRIBUTE_CATEGORIES.items():
-        available_attrs = [attr for attr in attributes if attr in district_data.columns]
+        available_attrs = [attr for attr in attributes if attr in district_percentage_cols]
         if available_attrs:
             filtered_categories[category] = available_attrs
     
@@ -145,10 +259,20 @@ def get_india_geo():
     return india_geo
 
 def get_state_data():
-    return state_data
+    return get_snapshot().state_frame()
+
+def get_state_aggregates():
+    return get_snapshot().state_aggregates
+
+def get_state_column_dtypes():
+    """Source dtype of every state column, loaded or not (key columns first)"""
+    return get_snapshot().state_column_dtypes()
+
+def get_column_metrics():
+    return get_snapshot().column_metrics()
 
 def get_district_data():
-    return district_data
+    return get_snapshot().district_frame()
 
 def get_state_file_map():
     return state_file_map
@@ -157,7 +281,106 @@ def get_state_dropdown_options():
     return state_dropdown_options
 
 def get_pct_cols():
-    return pct_cols
+    return list(get_snapshot().pct_cols)
 
 def get_district_percentage_cols():
-    return district_percentage_cols
+    return list(get_snapshot().district_percentage_cols)
+
+def get_district_state_index():
+    return get_snapshot().district_state_index
+
+def state_lookup_report(path, repeats=20):
+    """CPU time of one state selection (five district callbacks): mask + copy vs index slice"""
+    frame = read_cached(path)
+    frame = frame[['State name', 'District name'] + [c for c in frame.columns if '%' in str(c)]]
+    indexed, index = build_state_index(frame)
+    states = list(index)
+
+    def scan(state):
+        for _ in range(5):
+            frame[frame['State name'] == state].copy()
+
+    def sliced(state):
+        for _ in range(5):
+            start, stop = index[state]
+            indexed.iloc[start:stop]
+
+    for label, fn in (("mask + copy per callback", scan), ("state row-range index", sliced)):
+        start = time.process_time()
+        for _ in range(repeats):
+            for state in states:
+                fn(state)
+        ms = (time.process_time() - start) * 1000 / (repeats * len(states))
+        print(f"{label:>26}: {ms:7.3f} ms CPU per state selection")
+    sample = states[len(states) // 2]
+    rows = indexed.iloc[slice(*index[sample])]
+    print(f"{len(states)} states; slice of {sample} shares memory with the table: "
+          f"{np.shares_memory(rows[rows.columns[-1]].to_numpy(), indexed[indexed.columns[-1]].to_numpy())}")
+
+def reload_report(state_path="statewiseaggregated.csv", district_path="districtwise_data_percentages11_incsv.csv",
+                  interval=0.1, timeout=10.0):
+    """Hot reload with a second edit landing while the first one is being parsed, on
+    copies of the sources. True if the watcher reloads again and ends up serving the
+    second edit (rather than stopping at the version parsed before it)."""
+    global STATE_CSV, DISTRICT_CSV
+    import shutil
+    import tempfile
+    from data import columnar_cache
+
+    saved = STATE_CSV, DISTRICT_CSV, snapshot
+    csv_reader = columnar_cache.READERS['.csv']
+    folder = tempfile.mkdtemp()
+    watcher = None
+    try:
+        STATE_CSV = shutil.copy(state_path, folder)
+        DISTRICT_CSV = shutil.copy(district_path, folder)
+        _swap(None)
+        first = get_snapshot()
+        col = first.pct_cols[0]
+        state = first.state_frame()['State name'].iloc[0]
+        original = pd.read_csv(STATE_CSV)
+
+        def edit(delta):
+            frame = original.copy()
+            frame.loc[frame['State name'] == state, col] += delta
+            frame.to_csv(STATE_CSV, index=False)
+
+        mid_reload = threading.Event()
+
+        def parse_then_edit(source, **kwargs):
+            frame = csv_reader(source, **kwargs)
+            if not mid_reload.is_set():
+                mid_reload.set()
+                edit(2)
+            return frame
+
+        def served():
+            current = get_snapshot()
+            frame = current.state_store.require([col], count=False)
+            return current.version, float(frame.loc[frame['State name'] == state, col].iloc[0])
+
+        expected = float(original.loc[original['State name'] == state, col].iloc[0]) + 2
+        columnar_cache.READERS['.csv'] = parse_then_edit
+        watcher = DataWatcher(lambda: snapshot, reload_data, interval).start()
+        edit(1)
+        start = time.perf_counter()
+        version, value = served()
+        while not np.isclose(value, expected) and time.perf_counter() - start < timeout:
+            time.sleep(interval)
+            version, value = served()
+        ok = bool(np.isclose(value, expected)) and version >= first.version + 2
+        print(f"{col} of {state}: edited while version {first.version + 1} was being built; "
+              f"version {version} serves {value:g} (expected {expected:g}): {ok}")
+        return ok
+    finally:
+        if watcher:
+            watcher.stop()
+        columnar_cache.READERS['.csv'] = csv_reader
+        STATE_CSV, DISTRICT_CSV, old_snapshot = saved
+        _swap(old_snapshot)
+        shutil.rmtree(folder, ignore_errors=True)
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ['reload']:
+        sys.exit(0 if reload_report(*sys.argv[2:4]) else 1)
+    state_lookup_report(sys.argv[1] if len(sys.argv) > 1 else "districtwise_data_percentages11_incsv.csv")
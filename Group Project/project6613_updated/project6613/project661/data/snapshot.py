@@ -0,0 +1,118 @@
+# ===========================================
+# DATA SNAPSHOTS AND HOT RELOAD
+# ===========================================
+
+# Everything the callbacks read (tables, catalogs, the per-state row index and the
+# state aggregates) lives in one DataSnapshot. A callback takes the current snapshot
+# once and reads only from it, so a request that is running when the data changes
+# finishes on the version it started with. A snapshot is an append-only view, not a
+# frozen copy: its source files, rows, catalogs and row index are fixed when it is
+# built and a value it has served never changes, but attribute columns and cached
+# statistics are still loaded lazily on first use. A table whose file did not change
+# is shared with the previous version, so a column loaded through either snapshot
+# shows up in both; that is safe because both map the same cache copy.
+#
+# The DataWatcher polls the source files and, when they change, builds the next
+# snapshot in the background, warms it with the columns and statistics the current
+# one has served, and only then swaps it in with a single reference assignment.
+
+import os
+import threading
+import time
+from types import MappingProxyType
+import pandas as pd
+
+
+def source_stamp(path):
+    """(mtime, size) of a source file, or None if it is missing"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime, stat.st_size
+
+
+class DataSnapshot:
+    """One version of the loaded data: fixed rows and values, columns loaded on first use"""
+
+    def __init__(self, version, sources, state_store, district_store, state_aggregates, district_state_index):
+        self.version = version
+        self.created = time.time()
+        self.sources = MappingProxyType(dict(sources))
+        self.state_store = state_store
+        self.district_store = district_store
+        self.state_aggregates = state_aggregates
+        self.district_state_index = MappingProxyType(dict(district_state_index))
+        self.pct_cols = tuple(state_store.catalog) if state_store else ()
+        self.district_percentage_cols = tuple(district_store.catalog) if district_store else ()
+
+    def state_frame(self):
+        return self.state_store.frame if self.state_store else pd.DataFrame()
+
+    def district_frame(self):
+        return self.district_store.frame if self.district_store else pd.DataFrame()
+
+    def state_districts(self, state_name, columns=()):
+        """Districts of one state as a row slice, loading `columns` first if needed"""
+        if self.district_store is None:
+            return pd.DataFrame()
+        frame = self.district_store.require(columns)
+        start, stop = self.district_state_index.get(state_name, (0, 0))
+        return frame.iloc[start:stop]
+
+    def state_column_dtypes(self):
+        """Source dtype of every state column, loaded or not (key columns first)"""
+        if self.state_store is None:
+            return {}
+        return {col: self.state_store.dtypes[col] for col in self.state_store.columns()}
+
+    def changed_sources(self):
+        return [path for path, stamp in self.sources.items() if source_stamp(path) != stamp]
+
+    def warm_from(self, previous):
+        """Load the columns and statistics `previous` has served, before going live"""
+        if previous is None:
+            return
+        for store, old in ((self.state_store, previous.state_store),
+                           (self.district_store, previous.district_store)):
+            if store and old:
+                store.require(old.loaded(), count=False)
+        self.state_aggregates.warm(previous.state_aggregates.cached_attributes())
+
+    def column_metrics(self):
+        return {name: store.metrics() for name, store in
+                (('state', self.state_store), ('district', self.district_store)) if store}
+
+
+class DataWatcher:
+    """Background thread that rebuilds and swaps the snapshot when a source file changes"""
+
+    def __init__(self, current, reload, interval=2.0):
+        self.current = current      # () -> DataSnapshot being served
+        self.reload = reload        # () -> rebuilds and swaps in a new snapshot
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="data-watcher", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        pending = None
+        while not self._stop.wait(self.interval):
+            snapshot = self.current()
+            changed = snapshot.changed_sources() if snapshot else []
+            stamps = {path: source_stamp(path) for path in changed}
+            # Reload once a changed file has stopped changing (not while it is being written)
+            if changed and stamps == pending:
+                pending = None
+                try:
+                    self.reload()
+                except Exception as e:
+                    print(f"❌ Data reload failed, still serving version {snapshot.version}: {e}")
+            else:
+                pending = stamps if changed else None
@@ -0,0 +1,109 @@
+# ===========================================
+# MATERIALIZED STATE AGGREGATES
+# ===========================================
+
+# Every state callback used to run
+#     state_data[['State name', attr]].dropna().groupby('State name')[attr].mean()
+# on each attribute change (six identical groupbys per click). The loader now builds
+# the states x attributes mean table once, and the per-attribute values, sorted
+# order and summary statistics are cached on first use. Frames handed out are new
+# objects, so callbacks may add columns to them. With `fetch`, attributes that were
+# not loaded yet are fetched (and their means added) on first use.
+
+import threading
+import numpy as np
+import pandas as pd
+
+
+class StateAggregates:
+    """States x attributes table of per-state means, with per-attribute caches"""
+
+    def __init__(self, state_data, fetch=None):
+        self.means = self._state_means(state_data)
+        self.fetch = fetch
+        self._attributes = {}
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _state_means(state_data):
+        names = state_data['State name'] if 'State name' in state_data else pd.Series(dtype=object)
+        values = state_data.drop(columns=['State name'], errors='ignore').apply(pd.to_numeric, errors='coerce')
+        # groupby().mean() skips NaN per column, the same as dropna() on one attribute
+        return values.groupby(names).mean()
+
+    def _ensure(self, attrs):
+        """Add the means of attributes that are not in the table yet (needs `fetch`)"""
+        if self.fetch is None:
+            return
+        # Always asked, so the store's hit metrics count every use
+        state_data = self.fetch(attrs)
+        missing = [attr for attr in attrs if attr not in self.means.columns]
+        if not missing:
+            return
+        with self._lock:
+            missing = [attr for attr in missing if attr in state_data.columns and attr not in self.means.columns]
+            if missing:
+                self.means = pd.concat([self.means, self._state_means(state_data[['State name'] + missing])], axis=1)
+
+    def _attribute(self, attr):
+        """(state names, values, descending order) of one attribute, NaN states left out"""
+        self._ensure([attr])
+        with self._lock:
+            if attr not in self._attributes:
+                column = self.means[attr].dropna()
+                states = column.index.to_numpy(dtype=object)
+                values = column.to_numpy(dtype=np.float64)
+                order = np.argsort(-values, kind='stable')
+                for array in (states, values, order):
+                    array.flags.writeable = False
+                self._attributes[attr] = (states, values, order)
+            return self._attributes[attr]
+
+    def frame(self, attr):
+        """['State name', attr] per state in state-name order (the old groupby result)"""
+        states, values, _ = self._attribute(attr)
+        return pd.DataFrame({'State name': states, attr: values})
+
+    def ranked(self, attr, ascending=False):
+        """frame(attr) sorted by value, highest first unless ascending"""
+        states, values, order = self._attribute(attr)
+        order = order[::-1] if ascending else order
+        return pd.DataFrame({'State name': states[order], attr: values[order]})
+
+    def stats(self, attr):
+        """Summary statistics of one attribute across states (cached)"""
+        with self._lock:
+            cached = self._stats.get(attr)
+        if cached is not None:
+            return cached
+        states, values, _ = self._attribute(attr)
+        mean = values.mean()
+        best, worst = np.argmax(values), np.argmin(values)   # first state on ties, like idxmax
+        stats = {
+            'best_state': states[best], 'best': values[best],
+            'worst_state': states[worst], 'worst': values[worst],
+            'mean': mean, 'median': np.median(values), 'std': pd.Series(values).std(),
+            'q25': pd.Series(values).quantile(0.25), 'q75': pd.Series(values).quantile(0.75), 'min': values.min(), 'max': values.max(),
+            'above_mean': int((values > mean).sum()), 'count': len(values),
+        }
+        with self._lock:
+            self._stats[attr] = stats
+        return stats
+
+    def cached_attributes(self):
+        with self._lock:
+            return list(self._attributes)
+
+    def warm(self, attrs):
+        """Compute the values, order and statistics of `attrs` ahead of the first request"""
+        for attr in attrs:
+            try:
+                self.stats(attr)
+            except (KeyError, ValueError):
+                pass   # no longer in the data, or no values
+
+    def correlation(self, attrs):
+        """Correlation of attributes across the states that have all of them"""
+        self._ensure(list(attrs))
+        return self.means[list(attrs)].dropna().corr()
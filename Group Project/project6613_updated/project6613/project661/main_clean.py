@@ -12,7 +12,7 @@ import os
 
 # Import our organized modules
 from config.settings import COLORS, FONT_FAMILY, STATE_NAME_MAPPING
-from data.loader import load_all_data, get_india_geo, get_state_data, get_district_data, categorize_attributes, filter_district_categories
+from data.loader import load_all_data, get_india_geo, get_state_data, get_district_data, categorize_attributes, filter_district_categories, start_data_watcher
 from utils.helpers import get_short_label, get_district_short_label
 from utils.insights import generate_insights, create_insights_layout
 
@@ -152,4 +152,5 @@ if __name__ == '__main__':
     print("🌐 Access your dashboard at: http://127.0.0.1:8080")
     print("🎨 Refactored version running!")
     print("=" * 60)
+    start_data_watcher()   # hot-reload the census files when they change
     app.run(debug=True, host='127.0.0.1', port=8080)
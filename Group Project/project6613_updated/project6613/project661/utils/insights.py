@@ -3,36 +3,34 @@
 # ===========================================
 
 from dash import html
-from data.loader import get_state_data
+from data.loader import get_state_aggregates
 from utils.helpers import get_short_label
 
-def generate_insights(selected_attribute, state_data=None):
+def generate_insights(selected_attribute, state_aggregates=None):
     """Generate 5 key insights about India based on the selected attribute"""
     
     if not selected_attribute:
         return []
     
     try:
-        # Use provided state_data or load it
-        if state_data is None:
-            state_data = get_state_data()
+        # Use provided aggregates or the loader's
+        if state_aggregates is None:
+            state_aggregates = get_state_aggregates()
             
-        # Prepare data for analysis
-        insights_data = state_data[['State name', selected_attribute]].dropna()
-        insights_data = insights_data.groupby('State name')[selected_attribute].mean().reset_index()
-        
-        # Calculate key statistics
-        best_state = insights_data.loc[insights_data[selected_attribute].idxmax()]
-        worst_state = insights_data.loc[insights_data[selected_attribute].idxmin()]
-        national_avg = insights_data[selected_attribute].mean()
-        performance_gap = best_state[selected_attribute] - worst_state[selected_attribute]
-        above_avg_states = len(insights_data[insights_data[selected_attribute] > national_avg])
-        total_states = len(insights_data)
+        # Key statistics, precomputed per attribute
+        stats = state_aggregates.stats(selected_attribute)
+        best_state = {'State name': stats['best_state'], selected_attribute: stats['best']}
+        worst_state = {'State name': stats['worst_state'], selected_attribute: stats['worst']}
+        national_avg = stats['mean']
+        performance_gap = stats['best'] - stats['worst']
+        above_avg_states = stats['above_mean']
+        total_states = stats['count']
         
         # Calculate additional stats
-        top_25_percentile = insights_data[selected_attribute].quantile(0.75)
-        top_performers = insights_data[insights_data[selected_attribute] >= top_25_percentile]
-        std_dev = insights_data[selected_attribute].std()
+        top_25_percentile = stats['q75']
+        ranked = state_aggregates.ranked(selected_attribute)
+        top_performers = ranked[ranked[selected_attribute] >= top_25_percentile]
+        std_dev = stats['std']
         
         # Generate contextual insights based on attribute category
         attribute_lower = selected_attribute.lower()
@@ -10,11 +10,15 @@ import plotly.express as px
 import plotly.graph_objects as go
 import numpy as np
 import pandas as pd
+from data.district_store import DistrictStore
 
 # Load India geojson for map visualizations (state boundaries)
 with open("india.json", encoding="utf-8") as f:
     india_geo = json.load(f)
 
+# District table, parsed once and shared read-only by every district callback
+district_store = DistrictStore('districtwise_data_percentages.csv')
+
 # =========================
 # State and Population Data
 # =========================
@@ -787,7 +791,6 @@ def update_district_bar(selected_state, selected_category):
     """
     if not selected_state or not selected_category:
         return go.Figure()
-    df = pd.read_csv('districtwise_data_percentages.csv')
     # Find the state name from the selected key
     state_name = None
     for k, v in reverse_state_lookup.items():
@@ -796,7 +799,7 @@ def update_district_bar(selected_state, selected_category):
             break
     if not state_name:
         return go.Figure()
-    df_state = df[df['State name'].str.lower() == state_name.lower()]
+    df_state = district_store.state_frame(state_name)
     subcats = ATTRIBUTE_MAP.get(selected_category, [])
     subcats_pct = [c + '_pct' if c + '_pct' in df_state.columns else c for c in subcats]
     bar_data = {cat: df_state[cat].sum() for cat in subcats_pct if cat in df_state.columns}
@@ -877,7 +880,6 @@ def update_box_whisker_new(selected_state, selected_subcat):
     if not selected_state or not selected_subcat:
         raise PreventUpdate
     try:
-        df = pd.read_csv('districtwise_data_percentages.csv')
         # Get state name for lookup
         state_name = None
         for k, v in reverse_state_lookup.items():
@@ -886,7 +888,7 @@ def update_box_whisker_new(selected_state, selected_subcat):
                 break
         if not state_name:
             return go.Figure()
-        df_state = df[df['State name'].str.lower() == state_name.lower()]
+        df_state = district_store.state_frame(state_name)
         col = selected_subcat + '_pct' if (selected_subcat + '_pct') in df_state.columns else selected_subcat
         if col not in df_state.columns:
             return go.Figure()
@@ -958,7 +960,6 @@ def update_pie_charts(selected_state, selected_subcat):
     if not selected_state or not selected_subcat:
         return go.Figure(), go.Figure()
     try:
-        df = pd.read_csv('districtwise_data_percentages.csv')
         state_name = None
         for k, v in reverse_state_lookup.items():
             if v == selected_state:
@@ -966,7 +967,7 @@ def update_pie_charts(selected_state, selected_subcat):
                 break
         if not state_name:
             return go.Figure(), go.Figure()
-        df_state = df[df['State name'].str.lower() == state_name.lower()]
+        df_state = district_store.state_frame(state_name)
         col = selected_subcat + '_pct' if (selected_subcat + '_pct') in df_state.columns else selected_subcat
         if col not in df_state.columns:
             return go.Figure(), go.Figure()
@@ -1110,7 +1111,6 @@ def update_state_district_map(selected_state, selected_subcat):
         with open(filename, encoding="utf-8") as f:
             state_geo = json.load(f)
         # Load data
-        df = pd.read_csv('districtwise_data_percentages.csv')
         # Get state name for lookup
         state_name = None
         for k, v in reverse_state_lookup.items():
@@ -1119,7 +1119,7 @@ def update_state_district_map(selected_state, selected_subcat):
                 break
         if not state_name:
             return go.Figure()
-        df_state = df[df['State name'].str.lower() == state_name.lower()]
+        df_state = district_store.state_frame(state_name)
         col = selected_subcat + '_pct' if (selected_subcat + '_pct') in df_state.columns else selected_subcat
         if col not in df_state.columns:
             return go.Figure()
@@ -1241,7 +1241,6 @@ def update_correlation_scatter_v2(selected_state, selected_subcat, correlation_a
         }
         return go.Figure(), indicator_style, "Unrelated", "Select a state and two attributes to see their relationship across districts."
     try:
-        df = pd.read_csv('districtwise_data_percentages.csv')
         # Get state name for lookup
         state_name = None
         for k, v in reverse_state_lookup.items():
@@ -1261,7 +1260,7 @@ def update_correlation_scatter_v2(selected_state, selected_subcat, correlation_a
                 'backgroundColor': '#f8d7da'
             }
             return go.Figure(), indicator_style, "Unrelated", "No data for this state."
-        df_state = df[df['State name'].str.lower() == state_name.lower()]
+        df_state = district_store.state_frame(state_name)
         x_col = selected_subcat + '_pct' if (selected_subcat + '_pct') in df_state.columns else selected_subcat
         y_col = correlation_subcat + '_pct' if (correlation_subcat + '_pct') in df_state.columns else correlation_subcat
         if x_col not in df_state.columns or y_col not in df_state.columns:
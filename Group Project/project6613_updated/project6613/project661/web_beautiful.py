@@ -10,11 +10,15 @@ import plotly.express as px
 import plotly.graph_objects as go
 import numpy as np
 import pandas as pd
+from data.district_store import DistrictStore
 
 # Load India geojson for map visualizations (state boundaries)
 with open("india.json", encoding="utf-8") as f:
     india_geo = json.load(f)
 
+# District table, parsed once and shared read-only by every district callback
+district_store = DistrictStore('districtwise_data_percentages.csv')
+
 # =========================
 # State and Population Data
 # =========================
@@ -715,7 +719,6 @@ def update_district_bar(selected_state, selected_category):
         )
     
     try:
-        df = pd.read_csv('districtwise_data_percentages.csv')
         state_name = None
         for k, v in reverse_state_lookup.items():
             if v == selected_state:
@@ -725,7 +728,7 @@ def update_district_bar(selected_state, selected_category):
         if not state_name:
             return go.Figure()
             
-        df_state = df[df['State name'].str.lower() == state_name.lower()]
+        df_state = district_store.state_frame(state_name)
         subcats = ATTRIBUTE_MAP.get(selected_category, [])
         subcats_pct = [c + '_pct' if c + '_pct' in df_state.columns else c for c in subcats]
         bar_data = {cat: df_state[cat].sum() for cat in subcats_pct if cat in df_state.columns}
@@ -791,14 +794,13 @@ def update_box_whisker(selected_state, selected_subcat):
         )
     
     try:
-        df = pd.read_csv('districtwise_data_percentages.csv')
         state_name = None
         for k, v in reverse_state_lookup.items():
             if v == selected_state:
                 state_name = k
                 break
         
-        df_state = df[df['State name'].str.lower() == state_name.lower()]
+        df_state = district_store.state_frame(state_name)
         col = selected_subcat + '_pct' if (selected_subcat + '_pct') in df_state.columns else selected_subcat
         df_state = df_state[['District name', col]].dropna()
         
@@ -839,14 +841,13 @@ def update_pie_charts(selected_state, selected_subcat):
         return empty_fig, empty_fig
     
     try:
-        df = pd.read_csv('districtwise_data_percentages.csv')
         state_name = None
         for k, v in reverse_state_lookup.items():
             if v == selected_state:
                 state_name = k
                 break
         
-        df_state = df[df['State name'].str.lower() == state_name.lower()]
+        df_state = district_store.state_frame(state_name)
         col = selected_subcat + '_pct' if (selected_subcat + '_pct') in df_state.columns else selected_subcat
         df_state = df_state[['District name', col]].dropna().sort_values(by=col, ascending=False)
         
@@ -910,14 +911,13 @@ def update_state_district_map(selected_state, selected_subcat):
         with open(filename, encoding="utf-8") as f:
             state_geo = json.load(f)
             
-        df = pd.read_csv('districtwise_data_percentages.csv')
         state_name = None
         for k, v in reverse_state_lookup.items():
             if v == selected_state:
                 state_name = k
                 break
         
-        df_state = df[df['State name'].str.lower() == state_name.lower()]
+        df_state = district_store.state_frame(state_name)
         col = selected_subcat + '_pct' if (selected_subcat + '_pct') in df_state.columns else selected_subcat
         df_state = df_state[['District name', col]].dropna().sort_values(by=col, ascending=False)
         
@@ -998,14 +998,13 @@ def update_correlation_scatter(selected_state, selected_subcat, correlation_attr
                 "No Data", "Select all parameters to see correlation analysis")
     
     try:
-        df = pd.read_csv('districtwise_data_percentages.csv')
         state_name = None
         for k, v in reverse_state_lookup.items():
             if v == selected_state:
                 state_name = k
                 break
         
-        df_state = df[df['State name'].str.lower() == state_name.lower()]
+        df_state = district_store.state_frame(state_name)
         x_col = selected_subcat + '_pct' if (selected_subcat + '_pct') in df_state.columns else selected_subcat
         y_col = correlation_subcat + '_pct' if (correlation_subcat + '_pct') in df_state.columns else correlation_subcat
         
@@ -7,6 +7,7 @@ from dash import dcc, html, Input, Output, State
 import plotly.express as px
 import plotly.graph_objects as go
 import pandas as pd
+from data.district_store import DistrictStore
 import numpy as np
 import json
 
@@ -14,6 +15,9 @@ import json
 with open("india.json", encoding="utf-8") as f:
     india_geo = json.load(f)
 
+# District table, parsed once and shared read-only by every district callback
+district_store = DistrictStore('districtwise_data_percentages.csv')
+
 # =========================
 # State and Population Data
 # =========================
@@ -727,7 +731,6 @@ def update_district_bar(selected_state, selected_category):
     if not selected_state or not selected_category:
         return go.Figure()
     
-    df = pd.read_csv('districtwise_data_percentages.csv')
     state_name = None
     for k, v in reverse_state_lookup.items():
         if v == selected_state:
@@ -736,7 +739,7 @@ def update_district_bar(selected_state, selected_category):
     if not state_name:
         return go.Figure()
         
-    df_state = df[df['State name'].str.lower() == state_name.lower()]
+    df_state = district_store.state_frame(state_name)
     subcats = ATTRIBUTE_MAP.get(selected_category, [])
     subcats_pct = [c + '_pct' if c + '_pct' in df_state.columns else c for c in subcats]
     bar_data = {cat: df_state[cat].sum() for cat in subcats_pct if cat in df_state.columns}
@@ -792,7 +795,6 @@ def update_box_whisker(selected_state, selected_subcat):
         return go.Figure()
     
     try:
-        df = pd.read_csv('districtwise_data_percentages.csv')
         state_name = None
         for k, v in reverse_state_lookup.items():
             if v == selected_state:
@@ -801,7 +803,7 @@ def update_box_whisker(selected_state, selected_subcat):
         if not state_name:
             return go.Figure()
             
-        df_state = df[df['State name'].str.lower() == state_name.lower()]
+        df_state = district_store.state_frame(state_name)
         col = selected_subcat + '_pct' if (selected_subcat + '_pct') in df_state.columns else selected_subcat
         if col not in df_state.columns:
             return go.Figure()
@@ -836,7 +838,6 @@ def update_pie_charts(selected_state, selected_subcat):
         return go.Figure(), go.Figure()
     
     try:
-        df = pd.read_csv('districtwise_data_percentages.csv')
         state_name = None
         for k, v in reverse_state_lookup.items():
             if v == selected_state:
@@ -845,7 +846,7 @@ def update_pie_charts(selected_state, selected_subcat):
         if not state_name:
             return go.Figure(), go.Figure()
             
-        df_state = df[df['State name'].str.lower() == state_name.lower()]
+        df_state = district_store.state_frame(state_name)
         col = selected_subcat + '_pct' if (selected_subcat + '_pct') in df_state.columns else selected_subcat
         if col not in df_state.columns:
             return go.Figure(), go.Figure()
@@ -914,7 +915,6 @@ def update_state_district_map(selected_state, selected_subcat):
     
     try:
         # Load data first
-        df = pd.read_csv('districtwise_data_percentages.csv')
         state_name = None
         for k, v in reverse_state_lookup.items():
             if v == selected_state:
@@ -923,7 +923,7 @@ def update_state_district_map(selected_state, selected_subcat):
         if not state_name:
             return create_error_figure("State not found", selected_state)
             
-        df_state = df[df['State name'].str.lower() == state_name.lower()]
+        df_state = district_store.state_frame(state_name)
         col = selected_subcat + '_pct' if (selected_subcat + '_pct') in df_state.columns else selected_subcat
         if col not in df_state.columns:
             return create_error_figure("Data not available", selected_subcat)
@@ -1135,7 +1135,6 @@ def update_correlation_scatter(selected_state, selected_subcat, correlation_attr
         return go.Figure(), indicator_style, "No Data", "Select all parameters to see correlation analysis."
     
     try:
-        df = pd.read_csv('districtwise_data_percentages.csv')
         state_name = None
         for k, v in reverse_state_lookup.items():
             if v == selected_state:
@@ -1145,7 +1144,7 @@ def update_correlation_scatter(selected_state, selected_subcat, correlation_attr
             indicator_style = {'backgroundColor': '#f8d7da', 'display': 'inline-block', 'width': '20px', 'height': '20px', 'borderRadius': '50%'}
             return go.Figure(), indicator_style, "No Data", "State not found."
             
-        df_state = df[df['State name'].str.lower() == state_name.lower()]
+        df_state = district_store.state_frame(state_name)
         x_col = selected_subcat + '_pct' if (selected_subcat + '_pct') in df_state.columns else selected_subcat
         y_col = correlation_subcat + '_pct' if (correlation_subcat + '_pct') in df_state.columns else correlation_subcat
         
@@ -1235,7 +1234,6 @@ def update_district_detail_map(selected_state, selected_subcat):
             )
             return empty_fig, "📍 Select a State"
 
-        df = pd.read_csv('districtwise_data_percentages.csv')
         state_name = None
         for k, v in reverse_state_lookup.items():
             if v == selected_state:
@@ -1258,7 +1256,7 @@ def update_district_detail_map(selected_state, selected_subcat):
                 margin=dict(l=10, r=10, t=10, b=10)
             )
             return empty_fig, f"📍 {selected_state.replace('_', ' ').title()}"
-        df_state = df[df['State name'].str.lower() == state_name.lower()]
+        df_state = district_store.state_frame(state_name)
         if df_state.empty:
             empty_fig = go.Figure()
             empty_fig.add_annotation(
@@ -1475,7 +1473,6 @@ def update_district_detail_map(selected_state, selected_subcat):
             )
             return empty_fig, "📍 Select a State"
 
-        df = pd.read_csv('districtwise_data_percentages.csv')
         state_name = None
         for k, v in reverse_state_lookup.items():
             if v == selected_state:
@@ -1498,7 +1495,7 @@ def update_district_detail_map(selected_state, selected_subcat):
                 margin=dict(l=10, r=10, t=10, b=10)
             )
             return empty_fig, f"📍 {selected_state.replace('_', ' ').title()}"
-        df_state = df[df['State name'].str.lower() == state_name.lower()]
+        df_state = district_store.state_frame(state_name)
         if df_state.empty:
             empty_fig = go.Figure()
             empty_fig.add_annotation(